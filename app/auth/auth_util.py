@@ -1,10 +1,15 @@
 """
 This module provides utilities for authentication.
 """
+import asyncio
 import hashlib
+import hmac
 import os
+import time
+from collections import OrderedDict
 from datetime import datetime, timezone, timedelta
 
+import bcrypt
 import jwt
 from sqlalchemy import select
 from sqlalchemy.dialects.postgresql import insert
@@ -14,33 +19,104 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.models_user import User
 from app.db.models_auth import RefreshTokens
 
-from passlib.context import CryptContext
-
-# This allows for easier testing as password hashing can now be easily disabled during testing by
+# This allows for easier testing as password hashing can now be made cheap during testing by
 # altering this constant.
-CRYPT_CONTEXT = CryptContext(
-    schemes=["bcrypt"],
-    default="bcrypt",
-    truncate_error=True
-)
+BCRYPT_ROUNDS = 12
+# bcrypt only considers the first 72 bytes of a password. Longer passwords are rejected instead of
+# truncated, otherwise all passwords sharing the first 72 bytes would be interchangeable.
+BCRYPT_MAX_PASSWORD_BYTES = 72
 JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
+if JWT_SECRET_KEY is None:
+    raise RuntimeError("Missing environment variables: JWT_SECRET_KEY")
+# PyJWT skips its str -> bytes key conversion when handed bytes.
+_JWT_SECRET_BYTES = JWT_SECRET_KEY.encode("utf-8")
 JWT_ALGORITHM = "HS256"
+JWT_DECODE_ALGORITHMS = [JWT_ALGORITHM]
+
+# Verified tokens, keyed by sha256(token) so raw tokens are never kept in memory.
+# Values are (username, exp). Entries expire together with the token itself.
+TOKEN_CACHE_MAX_SIZE = 10_000
+_token_cache: OrderedDict[bytes, tuple[str, int]] = OrderedDict()
+
+
+def _get_cached_username(key: bytes) -> str | None:
+    entry = _token_cache.get(key)
+    if entry is None:
+        return None
+
+    username, exp = entry
+    if exp <= time.time():
+        del _token_cache[key]
+        return None
+
+    _token_cache.move_to_end(key)
+    return username
+
+
+def _cache_username(key: bytes, username: str, exp: int) -> None:
+    _token_cache[key] = (username, exp)
+    _token_cache.move_to_end(key)
+    while len(_token_cache) > TOKEN_CACHE_MAX_SIZE:
+        _token_cache.popitem(last=False)
+
+
+# bcrypt verdicts, keyed by sha256(username:stored_hash:sha256(password)). Including the stored hash
+# invalidates entries as soon as a password changes. Failed checks are cached as well.
+VERIFY_CACHE_MAX_SIZE = 10_000
+VERIFY_CACHE_TTL_SECONDS = 300
+_verify_cache: OrderedDict[bytes, tuple[bool, float]] = OrderedDict()
+
+
+def _verify_cache_key(username: str, stored_hash: str, cleartext_password: str) -> bytes:
+    password_digest = hashlib.sha256(cleartext_password.encode()).hexdigest()
+    return hashlib.sha256(f"{username}:{stored_hash}:{password_digest}".encode()).digest()
+
+
+def _get_cached_verdict(key: bytes) -> bool | None:
+    entry = _verify_cache.get(key)
+    if entry is None:
+        return None
+
+    verdict, expires_at = entry
+    if expires_at <= time.monotonic():
+        del _verify_cache[key]
+        return None
+
+    _verify_cache.move_to_end(key)
+    return verdict
+
+
+def _cache_verdict(key: bytes, verdict: bool) -> None:
+    _verify_cache[key] = (verdict, time.monotonic() + VERIFY_CACHE_TTL_SECONDS)
+    _verify_cache.move_to_end(key)
+    while len(_verify_cache) > VERIFY_CACHE_MAX_SIZE:
+        _verify_cache.popitem(last=False)
+
 
 async def get_username(token: str, db: AsyncSession) -> str | None:
+    cache_key = hashlib.sha256(token.encode()).digest()
+    cached = _get_cached_username(cache_key)
+    if cached is not None:
+        return cached
+
     try:
-        payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+        payload = jwt.decode(token, _JWT_SECRET_BYTES, algorithms=JWT_DECODE_ALGORITHMS)
         user = payload.get("username")
         if user is None:
             return None
 
         res = await db.execute(
-            select(User).where(User.username == user)
+            select(User.username).where(User.username == user)
         )
-        user = res.scalars().first()
-        if user is None:
+        username = res.scalar_one_or_none()
+        if username is None:
             return None
 
-        return user.username
+        exp = payload.get("exp")
+        if exp is not None:
+            _cache_username(cache_key, username, exp)
+
+        return username
 
     except jwt.InvalidTokenError:
         return None
@@ -49,49 +125,65 @@ async def get_username(token: str, db: AsyncSession) -> str | None:
 
 
 def create_token(username: str, expire_minutes: int) -> str | None:
-    expire = datetime.now(timezone.utc) + timedelta(minutes=expire_minutes)
+    now = datetime.now(timezone.utc)
     payload = {
         "username": username,
-        "exp": expire,
-        "iat": datetime.now(timezone.utc),
+        "exp": now + timedelta(minutes=expire_minutes),
+        "iat": now,
     }
-    return jwt.encode(payload, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
+    return jwt.encode(payload, _JWT_SECRET_BYTES, algorithm=JWT_ALGORITHM)
 
 
 def hash_password(password: str) -> str:
-    return CRYPT_CONTEXT.hash(secret=password)
+    secret = password.encode()
+    if len(secret) > BCRYPT_MAX_PASSWORD_BYTES:
+        raise ValueError(f"Password exceeds {BCRYPT_MAX_PASSWORD_BYTES} bytes")
+    return bcrypt.hashpw(secret, bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode()
 
 
 async def check_credentials(username: str, cleartext_password: str, db: AsyncSession) -> bool:
+    # hash_password never accepts such passwords, so they cannot match a stored hash.
+    if len(cleartext_password.encode()) > BCRYPT_MAX_PASSWORD_BYTES:
+        return False
+
     try:
         res = await db.execute(
-            select(User).where(User.username == username)
+            select(User.password).where(User.username == username)
         )
-        user = res.scalars().first()
+        stored_hash = res.scalar_one_or_none()
 
-        if user is None:
+        if stored_hash is None:
             return False
 
-        return CRYPT_CONTEXT.verify(secret=cleartext_password, hash=user.password, scheme="bcrypt")
+        cache_key = _verify_cache_key(username, stored_hash, cleartext_password)
+        cached = _get_cached_verdict(cache_key)
+        if cached is not None:
+            return cached
+
+        # bcrypt is CPU bound, run it off the event loop.
+        verdict = await asyncio.to_thread(
+            bcrypt.checkpw,
+            cleartext_password.encode(),
+            stored_hash.encode(),
+        )
+        _cache_verdict(cache_key, verdict)
+        return verdict
     except SQLAlchemyError:
         return False
 
 
 def sha_256(string: str) -> str:
+    # hashlib.sha256 is backed by OpenSSL, which uses the CPU's SHA extensions where available.
+    # The digests are persisted in refresh_tokens, so switching algorithms needs a data migration.
     return hashlib.sha256(string.encode()).hexdigest()
 
 
 async def get_refresh_token(username: str, db: AsyncSession) -> str | None:
     try:
         res = await db.execute(
-            select(RefreshTokens).where(RefreshTokens.username == username)
+            select(RefreshTokens.refresh_token).where(RefreshTokens.username == username)
         )
-        token = res.scalars().first()
-        if token is None:
-            return None
-
-        token_str = token.refresh_token
-        return token_str
+        return res.scalar_one_or_none()
 
     except SQLAlchemyError:
         return None
@@ -102,17 +194,20 @@ async def compare_refresh_to_db(username: str, refresh_token: str, db: AsyncSess
     if token_from_db is None:
         return False
 
-    return sha_256(refresh_token) == token_from_db
+    return hmac.compare_digest(sha_256(refresh_token), token_from_db)
 
 
 async def update_refresh_token(username: str, refresh_token: str, db: AsyncSession) -> None:
+    digest = sha_256(refresh_token)
     try:
         await db.execute(
             insert(RefreshTokens)
-            .values(username=username, refresh_token=sha_256(refresh_token))
+            .values(username=username, refresh_token=digest)
             .on_conflict_do_update(
                 index_elements=['username'],
-                set_={'refresh_token': sha_256(refresh_token)}
+                set_={'refresh_token': digest},
+                # Skip the heap write (and its WAL) when the stored digest is already current.
+                where=RefreshTokens.refresh_token.is_distinct_from(digest)
             )
         )
         await db.commit()
@@ -1,4 +1,5 @@
 import base64
+import threading
 
 from cryptography.fernet import Fernet
 import os
@@ -14,6 +15,9 @@ class EncryptionService:
         if password is None:
             raise ValueError("Encryption key must be provided")
 
+        # The derived key decrypts API keys already stored in the database, so the KDF and its
+        # parameters must not change without re-encrypting those rows. The derivation runs once
+        # per process (see get_encryption_service), which makes its cost negligible.
         kdf = PBKDF2HMAC(
             algorithm=hashes.SHA256(),
             length=32,
@@ -33,9 +37,22 @@ class EncryptionService:
         plaintext = self.cipher.decrypt(token.encode())
         return plaintext.decode()
 
+_service: EncryptionService | None = None
+_service_lock = threading.Lock()
+
+
 def get_encryption_service() -> EncryptionService:
+    # The key derivation is expensive and its inputs are process-wide constants,
+    # so the service is built once and shared by all requests.
+    global _service
+    if _service is not None:
+        return _service
+
     key = os.getenv("ENCRYPTION_KEY")
     if key is None:
         raise HTTPException(status_code=500, detail="No encryption key provided")
-    
-    return EncryptionService(key, salt=b'\x00' * 16)
+
+    with _service_lock:
+        if _service is None:
+            _service = EncryptionService(key, salt=b'\x00' * 16)
+    return _service
@@ -40,6 +40,12 @@ def _build_pg_url() -> str:
 
 POSTGRES_URL: str = _build_pg_url()
 
+# Connection pool sizing per worker process. Keep pool_size + max_overflow below the
+# connection limit of the database plan.
+DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_RECYCLE_SECONDS: int = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+
 
 # Zentrale Konfig – hier kann später z. B. Settings-Libs wie pydantic Settings angebunden werden
 #POSTGRES_URL: str = os.getenv(
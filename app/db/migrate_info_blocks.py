@@ -1,12 +1,12 @@
 from __future__ import annotations
 
 import asyncio
-import json
-from copy import deepcopy
 
-from sqlalchemy import select
+import orjson
 
-from app.db.models_project import Project
+from sqlalchemy import func, select, text, update
+
+from app.db.models_project import Project, info_blocks_empty_sql
 from app.db.session import async_session, init_models
 from app.routers.project import PROJECT_INFO_BLOCKS
 
@@ -15,7 +15,8 @@ def _default_blocks(lang: str) -> list[dict]:
     blocks = PROJECT_INFO_BLOCKS.get(lang)
     if not blocks:
         raise RuntimeError(f"Missing default project info blocks for language '{lang}'")
-    return [b.model_dump() for b in deepcopy(blocks)]
+    # model_dump already returns fresh dicts, the shared defaults are never mutated.
+    return [b.model_dump() for b in blocks]
 
 
 async def migrate_info_blocks() -> None:
@@ -23,39 +24,37 @@ async def migrate_info_blocks() -> None:
     default_en = _default_blocks("en")
     default_de = _default_blocks("de")
 
-    total = 0
-    migrated = 0
-    skipped = 0
-
     async with async_session() as session:
-        res = await session.execute(select(Project))
-        projects = res.scalars().all()
-        total = len(projects)
-
-        for project in projects:
-            changed = False
-            if not project.info_blocks_en:
-                project.info_blocks_en = deepcopy(default_en)
-                changed = True
-            if not project.info_blocks_de:
-                project.info_blocks_de = deepcopy(default_de)
-                changed = True
-
-            if changed:
-                migrated += 1
-                print(f"[migrated] slug={project.slug}")
-            else:
-                skipped += 1
-                print(f"[skipped] slug={project.slug}")
+        total = await session.scalar(select(func.count()).select_from(Project))
+
+        # Two set-based UPDATEs instead of loading and rewriting every project row. The literal
+        # predicates match ix_projects_info_blocks_missing, so only unmigrated rows are visited.
+        res_en = await session.execute(
+            update(Project)
+            .where(text(info_blocks_empty_sql("info_blocks_en")))
+            .values(info_blocks_en=default_en)
+            .returning(Project.id, Project.slug)
+        )
+        migrated_slugs = dict(res_en.all())
+
+        res_de = await session.execute(
+            update(Project)
+            .where(text(info_blocks_empty_sql("info_blocks_de")))
+            .values(info_blocks_de=default_de)
+            .returning(Project.id, Project.slug)
+        )
+        migrated_slugs.update(res_de.all())
 
         await session.commit()
 
+    migrated = len(migrated_slugs)
     summary = {
         "total_projects": total,
         "migrated_projects": migrated,
-        "skipped_projects": skipped,
+        "skipped_projects": total - migrated,
+        "migrated_slugs": list(migrated_slugs.values()),
     }
-    print(json.dumps(summary, indent=2))
+    print(orjson.dumps(summary, option=orjson.OPT_INDENT_2).decode())
 
 
 if __name__ == "__main__":
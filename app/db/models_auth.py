@@ -1,5 +1,5 @@
 from __future__ import annotations
-from sqlalchemy import String, ForeignKey, Text
+from sqlalchemy import String, ForeignKey, Index, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
@@ -10,3 +10,12 @@ class RefreshTokens(Base):
     username: Mapped[str] = mapped_column(ForeignKey("users.username"), nullable=False, primary_key=True)
     refresh_token: Mapped[str] = mapped_column(Text)
 
+    # Lets get_refresh_token be answered by an index-only scan.
+    __table_args__ = (
+        Index(
+            "ix_refresh_tokens_username_covering",
+            "username",
+            postgresql_include=["refresh_token"],
+        ),
+    )
+
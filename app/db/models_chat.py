@@ -62,6 +62,11 @@ class ChatSession(Base):
         passive_deletes=True,
     )
 
+    # One chat session per interview session, also the conflict target of the get-or-create upsert.
+    __table_args__ = (
+        Index("ix_chat_sessions_interview_session_id", "interview_session_id", unique=True),
+    )
+
 
 class ChatInteraction(Base):
     __tablename__ = "chat_interactions"
@@ -1,12 +1,31 @@
-from sqlalchemy import ForeignKey, String, func, Integer, Boolean
+from sqlalchemy import ForeignKey, String, func, Integer, Boolean, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from .base import Base
 from app.db.models_user import User
 from datetime import datetime
 
+
+def info_blocks_empty_sql(column: str) -> str:
+    """SQL predicate matching projects whose info block column still needs the defaults."""
+    return f"({column} IS NULL OR {column} IN ('null'::jsonb, '[]'::jsonb, '{{}}'::jsonb))"
+
+
+INFO_BLOCKS_MISSING_SQL = (
+    f"{info_blocks_empty_sql('info_blocks_en')} OR {info_blocks_empty_sql('info_blocks_de')}"
+)
+
+
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        # Small partial index so migrate_info_blocks does not scan already migrated projects.
+        Index(
+            "ix_projects_info_blocks_missing",
+            "id",
+            postgresql_where=text(INFO_BLOCKS_MISSING_SQL),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
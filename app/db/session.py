@@ -1,7 +1,11 @@
 from __future__ import annotations
 import os
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator
+
+import orjson
+
 from .models_user import User
+from .models_project import INFO_BLOCKS_MISSING_SQL
 from sqlalchemy import select, text
 
 from app.auth.auth_util import hash_password
@@ -12,12 +16,41 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 
-from .config import POSTGRES_URL
+from .config import (
+    DB_MAX_OVERFLOW,
+    DB_POOL_RECYCLE_SECONDS,
+    DB_POOL_SIZE,
+    POSTGRES_URL,
+)
 from .base import Base  # noqa: F401
 
 
 # ───────────────────────── engine & session factory ─────────────────────────
-engine = create_async_engine(POSTGRES_URL, echo=False)
+def _json_serializer(value: Any) -> str:
+    # OPT_NON_STR_KEYS keeps stdlib json's behaviour of stringifying int dict keys.
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+engine = create_async_engine(
+    POSTGRES_URL,
+    echo=False,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_recycle=DB_POOL_RECYCLE_SECONDS,
+    pool_pre_ping=False,
+    # The default rollback-on-return stays enabled: SQLAlchemy's asyncpg adapter opens
+    # transactions lazily, so returning an already committed/closed session's connection does
+    # not hit the server, while the rollback still protects against leaked transactions.
+    pool_reset_on_return="rollback",
+    connect_args={
+        # asyncpg's own statement cache and SQLAlchemy's prepared statement cache,
+        # both kept per connection so hot queries are not re-prepared.
+        "statement_cache_size": 1024,
+        "prepared_statement_cache_size": 1024,
+    },
+)
 async_session = async_sessionmaker(engine, expire_on_commit=False)
 
 
@@ -31,6 +64,17 @@ def get_sessionmaker() -> async_sessionmaker[AsyncSession]:
     return async_session
 
 # ───────────────────────── schema initialisation ────────────────────────────
+# Chat sessions that share their interview session with an older one, paired with the id of
+# the oldest session (the one that is kept).
+_CHAT_SESSION_DUPLICATES_CTE = (
+    "WITH ranked AS ("
+    " SELECT id, first_value(id) OVER ("
+    "  PARTITION BY interview_session_id ORDER BY created_at NULLS LAST, id"
+    " ) AS keep_id FROM chat_sessions"
+    "), duplicates AS (SELECT id, keep_id FROM ranked WHERE id <> keep_id) "
+)
+
+
 async def init_models() -> None:
     """
     Legt alle in Base.metadata registrierten Tabellen an,
@@ -46,12 +90,47 @@ async def init_models() -> None:
         await conn.run_sync(Base.metadata.create_all)
 
         # Ensure newer nullable project columns also exist on already provisioned DBs.
-        await conn.execute(text("ALTER TABLE projects ADD COLUMN IF NOT EXISTS finish_next_title VARCHAR(500)"))
-        await conn.execute(text("ALTER TABLE projects ADD COLUMN IF NOT EXISTS finish_next_body VARCHAR(2000)"))
-        await conn.execute(text("ALTER TABLE projects ADD COLUMN IF NOT EXISTS finish_next_link VARCHAR(2000)"))
-        await conn.execute(text("ALTER TABLE projects ADD COLUMN IF NOT EXISTS stt_provider VARCHAR(32)"))
-        await conn.execute(text("ALTER TABLE projects ADD COLUMN IF NOT EXISTS info_blocks_en JSONB"))
-        await conn.execute(text("ALTER TABLE projects ADD COLUMN IF NOT EXISTS info_blocks_de JSONB"))
+        # A single ALTER TABLE keeps this to one round-trip and one lock acquisition.
+        await conn.execute(text(
+            "ALTER TABLE projects "
+            "ADD COLUMN IF NOT EXISTS finish_next_title VARCHAR(500), "
+            "ADD COLUMN IF NOT EXISTS finish_next_body VARCHAR(2000), "
+            "ADD COLUMN IF NOT EXISTS finish_next_link VARCHAR(2000), "
+            "ADD COLUMN IF NOT EXISTS stt_provider VARCHAR(32), "
+            "ADD COLUMN IF NOT EXISTS info_blocks_en JSONB, "
+            "ADD COLUMN IF NOT EXISTS info_blocks_de JSONB"
+        ))
+
+        # Indexes added after the initial schema, create_all only emits them for new tables.
+        await conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_refresh_tokens_username_covering "
+            "ON refresh_tokens (username) INCLUDE (refresh_token)"
+        ))
+        await conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_projects_info_blocks_missing "
+            f"ON projects (id) WHERE {INFO_BLOCKS_MISSING_SQL}"
+        ))
+        # The get-or-create upsert needs a unique index on interview_session_id. Databases from
+        # before it may hold duplicate chat sessions (SELECT-then-INSERT race), which would make
+        # CREATE UNIQUE INDEX fail, so merge them first: keep the oldest session per interview
+        # session and move the interactions of the others onto it.
+        unique_index = await conn.scalar(
+            text("SELECT to_regclass('ix_chat_sessions_interview_session_id')")
+        )
+        if unique_index is None:
+            # Block concurrent inserts until the index exists, so no new duplicate slips in
+            await conn.execute(text("LOCK TABLE chat_sessions IN SHARE ROW EXCLUSIVE MODE"))
+            await conn.execute(text(_CHAT_SESSION_DUPLICATES_CTE + (
+                "UPDATE chat_interactions ci SET session_id = d.keep_id "
+                "FROM duplicates d WHERE ci.session_id = d.id"
+            )))
+            await conn.execute(text(_CHAT_SESSION_DUPLICATES_CTE + (
+                "DELETE FROM chat_sessions cs USING duplicates d WHERE cs.id = d.id"
+            )))
+            await conn.execute(text(
+                "CREATE UNIQUE INDEX IF NOT EXISTS ix_chat_sessions_interview_session_id "
+                "ON chat_sessions (interview_session_id)"
+            ))
 
     should_seed_admin = os.getenv("SEED_DEFAULT_ADMIN", "false").lower() in (
         "1",
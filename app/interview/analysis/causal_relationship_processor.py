@@ -4,6 +4,7 @@ Handles the analysis and processing of causal relationships between elements.
 """
 
 import logging
+from collections import defaultdict, deque
 from typing import Dict, List, Set, Tuple, Any, Optional
 
 from app.interview.interview_tree.node import Node
@@ -13,12 +14,53 @@ from app.interview.interview_tree.tree import Tree as InterviewTree
 logger = logging.getLogger(__name__)
 
 
+class RelationshipIndex:
+    """
+    Causal relationships of one message, indexed for graph traversal.
+
+    Attributes:
+        edges: Valid relationships as (source key, target key, relationship) triples,
+            including repeated ones so every relationship object can be filtered
+        forward: Source key (label, summary) -> list of distinct target keys
+        source_keys: Every valid source element key
+        target_keys: Every valid target element key
+        keys: Element keys taking part in a complete relationship, the position is the
+            interned integer id used by the id-based adjacency lists
+        forward_ids: Id -> ids of its targets
+        reverse_ids: Id -> ids of its sources
+    """
+
+    __slots__ = ("edges", "forward", "source_keys", "target_keys", "keys", "forward_ids", "reverse_ids")
+
+    def __init__(self):
+        self.edges = []
+        self.forward = {}
+        self.source_keys = set()
+        self.target_keys = set()
+        self.keys = []
+        self.forward_ids = []
+        self.reverse_ids = []
+
+
 class CausalRelationshipProcessor:
     """
     Processes causal relationships between elements in the interview analysis.
     Handles the identification of complete chains, filtering, and relationship mapping.
     """
 
+    # Special handling for source elements that aren't new, keyed by (active label, source label).
+    # Case 1: Active node is A and source element is A or C -> targets are created without parent
+    # Case 2: Active node is C and source element is C or V -> targets are created without parent
+    # Case 3: Active node is C and source element is A -> source and targets are ignored
+    IGNORE_DEPENDENTS = "Case 3"
+    SPECIAL_CASES = {
+        (NodeLabel.ATTRIBUTE, NodeLabel.ATTRIBUTE): "Case 1",
+        (NodeLabel.ATTRIBUTE, NodeLabel.CONSEQUENCE): "Case 1",
+        (NodeLabel.CONSEQUENCE, NodeLabel.CONSEQUENCE): "Case 2",
+        (NodeLabel.CONSEQUENCE, NodeLabel.VALUE): "Case 2",
+        (NodeLabel.CONSEQUENCE, NodeLabel.ATTRIBUTE): IGNORE_DEPENDENTS,
+    }
+
     def __init__(self, tree: InterviewTree):
         """
         Initialize the processor with the interview tree.
@@ -27,68 +69,122 @@ class CausalRelationshipProcessor:
             tree: The interview tree to work with
         """
         self.tree = tree
+        # (causal_relationships, index) of the last indexed relationship list
+        self._relationship_index_cache = None
 
-    def build_element_mappings(self, elements: List[Tuple[NodeLabel, str, bool]],
-                               causal_relationships: List[Dict[str, Any]]):
+    def _index_relationships(self, causal_relationships):
         """
-        Build mappings for elements and relationships.
+        Indexes the causal relationships in a single pass. The result is cached for the
+        last list seen, so the filter steps and build_element_mappings, which all receive
+        the same list for one message, share it. Treat the returned structures as read-only.
 
         Args:
-            elements: List of element tuples (NodeLabel, summary, is_new)
             causal_relationships: List of causal relationships
 
         Returns:
-            Tuple of (elements_map, elements_in_relationships, source_elements,
-                     target_elements, end_nodes_keys, relationship_map)
+            RelationshipIndex for the given relationships
         """
-        # Mapping of (label, summary) -> element tuple
-        elements_map = {}
-
-        # Create map for quick access to elements
-        for elem in elements:
-            element_label, element_summary, is_new_element = elem
-            elements_map[(element_label, element_summary)] = elem
-
-        # Identify all elements that appear in causal relationships
-        elements_in_relationships = set()
-        source_elements = set()  # Elements that appear as source
-        target_elements = set()  # Elements that appear as target
+        cached = self._relationship_index_cache
+        if cached is not None and cached[0] is causal_relationships:
+            return cached[1]
+
+        index = RelationshipIndex()
+        forward = defaultdict(list)
+        key_ids = {}
+        seen_pairs = set()
+        keys = index.keys
+        forward_ids = index.forward_ids
+        reverse_ids = index.reverse_ids
+
+        def intern(key):
+            key_id = key_ids.get(key)
+            if key_id is None:
+                key_id = key_ids[key] = len(keys)
+                keys.append(key)
+                forward_ids.append([])
+                reverse_ids.append([])
+            return key_id
 
         for rel in causal_relationships:
             source_elem = rel.get("source_element")
             target_elem = rel.get("target_element")
 
+            source_key = None
+            target_key = None
             if source_elem and len(source_elem) >= 2:
-                # (Label, Summary)
-                source_key = (source_elem[0], source_elem[1])
-                elements_in_relationships.add(source_key)
-                source_elements.add(source_key)
-
+                source_key = (source_elem[0], source_elem[1])  # (Label, Summary)
+                index.source_keys.add(source_key)
             if target_elem and len(target_elem) >= 2:
-                # (Label, Summary)
-                target_key = (target_elem[0], target_elem[1])
-                elements_in_relationships.add(target_key)
-                target_elements.add(target_key)
+                target_key = (target_elem[0], target_elem[1])  # (Label, Summary)
+                index.target_keys.add(target_key)
 
-        # Determine end nodes: Target elements that never appear as source
-        end_nodes_keys = target_elements - source_elements
+            if source_key is None or target_key is None:
+                continue
 
-        # Group causal relationships by Source element
-        relationship_map = {}
-        for rel in causal_relationships:
-            source_elem = rel.get("source_element")
-            target_elem = rel.get("target_element")
+            index.edges.append((source_key, target_key, rel))
 
-            if not source_elem or not target_elem or len(source_elem) < 2 or len(target_elem) < 2:
+            # The LLM may report the same relationship twice, keep the adjacency free of repeats
+            if (source_key, target_key) in seen_pairs:
                 continue
+            seen_pairs.add((source_key, target_key))
 
-            source_key = (source_elem[0], source_elem[1])  # (Label, Summary)
-            target_key = (target_elem[0], target_elem[1])  # (Label, Summary)
+            forward[source_key].append(target_key)
+            source_id = intern(source_key)
+            target_id = intern(target_key)
+            forward_ids[source_id].append(target_id)
+            reverse_ids[target_id].append(source_id)
 
-            if source_key not in relationship_map:
-                relationship_map[source_key] = []
+        index.forward = forward
+        self._relationship_index_cache = (causal_relationships, index)
+        return index
 
-            relationship_map[source_key].append(target_key)
+    @staticmethod
+    def _classify_elements(elements):
+        """
+        Groups element keys by label in a single pass.
+
+        Args:
+            elements: List of element tuples (NodeLabel, summary, is_new)
+
+        Returns:
+            Dict of NodeLabel -> set of (label, summary) keys, with an entry for every label
+        """
+        by_label = {label: set() for label in NodeLabel}
+        for elem in elements:
+            by_label[elem[0]].add((elem[0], elem[1]))
+        return by_label
+
+    def build_element_mappings(self, elements: List[Tuple[NodeLabel, str, bool]],
+                               causal_relationships: List[Dict[str, Any]]):
+        """
+        Build mappings for elements and relationships.
+
+        Args:
+            elements: List of element tuples (NodeLabel, summary, is_new)
+            causal_relationships: List of causal relationships
+
+        Returns:
+            Tuple of (elements_map, elements_in_relationships, source_elements,
+                     target_elements, end_nodes_keys, relationship_map), where elements_map
+                     is nested as {label: {summary: element}}
+        """
+        # Mapping of label -> summary -> element tuple
+        elements_map = {}
+
+        # Create map for quick access to elements
+        for elem in elements:
+            elements_map.setdefault(elem[0], {})[elem[1]] = elem
+
+        index = self._index_relationships(causal_relationships)
+        relationship_map = index.forward
+        source_elements = index.source_keys
+        target_elements = index.target_keys
+
+        # Identify all elements that appear in causal relationships
+        elements_in_relationships = source_elements | target_elements
+
+        # Determine end nodes: Target elements that never appear as source
+        end_nodes_keys = target_elements - source_elements
 
         return (elements_map, elements_in_relationships, source_elements,
                 target_elements, end_nodes_keys, relationship_map)
@@ -105,76 +201,28 @@ class CausalRelationshipProcessor:
         Returns:
             Set of Value tuples (label, summary) that are part of a complete ACV chain
         """
-        values_in_acv_chains = set()
-        
-        # Create maps of elements by type for quick access
-        attribute_elements = {
-            (NodeLabel.ATTRIBUTE, elem[1]) for elem in elements if elem[0] == NodeLabel.ATTRIBUTE}
-        value_elements = {
-            (NodeLabel.VALUE, elem[1]) for elem in elements if elem[0] == NodeLabel.VALUE}
-        
-        # Build a complete relationship graph
-        relationship_graph = {}
-        
-        for rel in causal_relationships:
-            source_elem = rel.get("source_element")
-            target_elem = rel.get("target_element")
-            
-            if not source_elem or not target_elem or len(source_elem) < 2 or len(target_elem) < 2:
-                continue
-                
-            source_key = (source_elem[0], source_elem[1])
-            target_key = (target_elem[0], target_elem[1])
-            
-            if source_key not in relationship_graph:
-                relationship_graph[source_key] = []
-            relationship_graph[source_key].append(target_key)
+        value_elements = self._classify_elements(elements)[NodeLabel.VALUE]
         
-        # Helper function for recursive path tracing
-        def is_connected_to_attribute(node_key, visited=None):
-            if visited is None:
-                visited = set()
-                
-            # Avoid cycles
-            if node_key in visited:
-                return False
-                
-            visited.add(node_key)
-            
-            # Check all incoming relationships
-            for source_key, targets in relationship_graph.items():
-                if node_key in targets:
-                    # If source is an Attribute, we found a path
-                    if source_key[0] == NodeLabel.ATTRIBUTE:
-                        logger.info(f"Found attribute connection: {source_key[1]} → ... → {node_key[1]}")
-                        return True
-                        
-                    # If source is something else, check recursively
-                    if is_connected_to_attribute(source_key, visited):
-                        return True
-                        
-            return False
-        
-        # For each Value element, check if it's part of any ACV chain
-        for value_elem in value_elements:
-            # Check direct connections first (optimization)
-            direct_connection = False
-            for source_key, targets in relationship_graph.items():
-                if value_elem in targets and source_key[0] == NodeLabel.CONSEQUENCE:
-                    # Check if this Consequence is connected to an Attribute (directly or indirectly)
-                    if is_connected_to_attribute(source_key):
-                        logger.info(f"Complete ACV chain found ending with: {source_key[1]} → {value_elem[1]}")
-                        values_in_acv_chains.add(value_elem)
-                        direct_connection = True
-                        break
-            
-            if direct_connection:
-                continue
-                
-            # Otherwise check if the Value is indirectly connected to an Attribute
-            if is_connected_to_attribute(value_elem):
-                logger.info(f"Complex ACV chain found ending with value: {value_elem[1]}")
-                values_in_acv_chains.add(value_elem)
+        index = self._index_relationships(causal_relationships)
+        keys = index.keys
+        forward_ids = index.forward_ids
+
+        # A Value is part of a complete chain iff it can be reached from any Attribute, so a
+        # single breadth-first search seeded with all Attributes answers it for every Value.
+        # Ids are dense, so a bytearray serves as the visited set.
+        queue = deque(key_id for key_id, key in enumerate(keys) if key[0] == NodeLabel.ATTRIBUTE)
+        reachable_ids = bytearray(len(keys))
+        while queue:
+            node_id = queue.popleft()
+            for target_id in forward_ids[node_id]:
+                if not reachable_ids[target_id]:
+                    reachable_ids[target_id] = 1
+                    queue.append(target_id)
+
+        reachable = {key for key, is_reachable in zip(keys, reachable_ids) if is_reachable}
+        values_in_acv_chains = value_elements & reachable
+        for value_elem in values_in_acv_chains:
+            logger.debug("Complete ACV chain found ending with value: %s", value_elem[1])
         
         return values_in_acv_chains
 
@@ -189,6 +237,11 @@ class CausalRelationshipProcessor:
         Returns:
             Tuple of (filtered_elements, filtered_relationships)
         """
+        # Without an Attribute and a Value no complete chain is possible, skip building the graph
+        detected_labels = {elem[0] for elem in elements}
+        if NodeLabel.ATTRIBUTE not in detected_labels or NodeLabel.VALUE not in detected_labels:
+            return elements, causal_relationships
+
         # Identify Values that are part of complete ACV chains
         values_in_acv_chains = self.identify_values_in_complete_acv_chains(
             elements, causal_relationships)
@@ -197,86 +250,72 @@ class CausalRelationshipProcessor:
             return elements, causal_relationships
 
         logger.info(
-            f"Found: {len(values_in_acv_chains)} Values in complete ACV chains")
+            "Found: %d Values in complete ACV chains", len(values_in_acv_chains))
 
         # Filter out Values that are part of a complete ACV chain
         filtered_elements = []
         for elem in elements:
             label, summary, is_new = elem
             if label == NodeLabel.VALUE and (label, summary) in values_in_acv_chains:
-                logger.info(
-                    f"Removing Value from complete ACV chain: '{summary}'")
+                logger.debug(
+                    "Removing Value from complete ACV chain: '%s'", summary)
             else:
                 filtered_elements.append(elem)
 
         # Also filter out corresponding C→V relationships from causal_relationships
-        filtered_relationships = []
-        for rel in causal_relationships:
-            source_elem = rel.get("source_element")
-            target_elem = rel.get("target_element")
-
+        removed_relationships = set()
+        for source_key, target_key, rel in self._index_relationships(causal_relationships).edges:
             # Check if this is a C→V relationship to be removed
-            if (source_elem and target_elem and
-                len(source_elem) >= 2 and len(target_elem) >= 2 and
-                    source_elem[0] == NodeLabel.CONSEQUENCE and target_elem[0] == NodeLabel.VALUE):
+            if (source_key[0] == NodeLabel.CONSEQUENCE and target_key[0] == NodeLabel.VALUE
+                    and target_key in values_in_acv_chains):
+                logger.debug(
+                    "Removing C→V relationship: '%s' → '%s'", source_key[1], target_key[1])
+                removed_relationships.add(id(rel))
 
-                target_key = (target_elem[0], target_elem[1])
-                if target_key in values_in_acv_chains:
-                    logger.info(
-                        f"Removing C→V relationship: '{source_elem[1]}' → '{target_elem[1]}'")
-                    continue  # Don't add this relationship to filtered list
-
-            # Keep all other relationships
-            filtered_relationships.append(rel)
+        # Keep all other relationships
+        filtered_relationships = [
+            rel for rel in causal_relationships if id(rel) not in removed_relationships]
 
         logger.info(
-            f"After ACV chain filtering: {len(filtered_elements)} elements and {len(filtered_relationships)} relationships remain")
+            "After ACV chain filtering: %d elements and %d relationships remain",
+            len(filtered_elements), len(filtered_relationships))
 
         return filtered_elements, filtered_relationships
 
-    def is_connected_to_value(self, consequence_key, causal_relationships, visited=None):
+    def _consequences_connected_to_values(self, causal_relationships):
         """
-        Recursively checks if a Consequence is connected to a Value.
+        Computes all Consequences that lead to a Value via Consequences only, in one sweep.
 
         Args:
-            consequence_key: The key of the consequence to check
             causal_relationships: List of causal relationships
-            visited: Set of already visited keys
 
         Returns:
-            True if connected to a Value, False otherwise
+            Set of Consequence keys (label, summary) connected to a Value
         """
-        if visited is None:
-            visited = set()
-
-        # Avoid infinite loops
-        if consequence_key in visited:
-            return False
-
-        visited.add(consequence_key)
-
-        # Check all causal relationships
-        for rel in causal_relationships:
-            source = rel.get("source_element")
-            target = rel.get("target_element")
-
-            if not source or not target or len(source) < 2 or len(target) < 2:
-                continue
-
-            source_key = (source[0], source[1])
-            target_key = (target[0], target[1])
-
-            # Case 1: This Consequence leads directly to a Value
-            if source_key == consequence_key and target[0] == NodeLabel.VALUE:
-                return True
-
-            # Case 2: This Consequence leads to another Consequence
-            if source_key == consequence_key and target[0] == NodeLabel.CONSEQUENCE:
-                # Recursively check if the target Consequence is connected to a Value
-                if self.is_connected_to_value(target_key, causal_relationships, visited):
-                    return True
-
-        return False
+        index = self._index_relationships(causal_relationships)
+        keys = index.keys
+        reverse_ids = index.reverse_ids
+        is_consequence = [key[0] == NodeLabel.CONSEQUENCE for key in keys]
+
+        # Consequences with a direct C→V relationship
+        stack = [
+            key_id for key_id, target_ids in enumerate(index.forward_ids)
+            if is_consequence[key_id]
+            and any(keys[target_id][0] == NodeLabel.VALUE for target_id in target_ids)
+        ]
+        connected_ids = bytearray(len(keys))
+        for key_id in stack:
+            connected_ids[key_id] = 1
+
+        # Walk the C→C edges backwards from the Consequences that reach a Value directly
+        while stack:
+            node_id = stack.pop()
+            for source_id in reverse_ids[node_id]:
+                if is_consequence[source_id] and not connected_ids[source_id]:
+                    connected_ids[source_id] = 1
+                    stack.append(source_id)
+
+        return {key for key, is_connected in zip(keys, connected_ids) if is_connected}
 
     def filter_consequences_without_values(self, elements, causal_relationships):
         """
@@ -293,11 +332,10 @@ class CausalRelationshipProcessor:
             return elements
 
         # Check if both Consequences and Values were detected
-        has_consequences = any(
-            element[0] == NodeLabel.CONSEQUENCE for element in elements)
-        has_values = any(element[0] == NodeLabel.VALUE for element in elements)
+        by_label = self._classify_elements(elements)
+        consequence_elements = by_label[NodeLabel.CONSEQUENCE]
 
-        if not (has_consequences and has_values):
+        if not (consequence_elements and by_label[NodeLabel.VALUE]):
             return elements
 
         logger.info(
@@ -307,26 +345,18 @@ class CausalRelationshipProcessor:
         connected_consequences = set()
 
         # First collect all direct C→V relationships
-        for rel in causal_relationships:
-            source_elem = rel.get("source_element")
-            target_elem = rel.get("target_element")
-
-            # Direct relationship from C→V
-            if (source_elem and target_elem and
-                len(source_elem) >= 2 and len(target_elem) >= 2 and
-                    source_elem[0] == NodeLabel.CONSEQUENCE and target_elem[0] == NodeLabel.VALUE):
+        for source_key, target_key, _ in self._index_relationships(causal_relationships).edges:
+            if source_key[0] == NodeLabel.CONSEQUENCE and target_key[0] == NodeLabel.VALUE:
                 # Mark C as connected
-                connected_consequences.add(
-                    (source_elem[0], source_elem[1]))
+                connected_consequences.add(source_key)
 
         # Now check all Consequences (that aren't directly connected) for indirect connections
-        for elem in elements:
-            label, summary, is_new = elem
-            if label == NodeLabel.CONSEQUENCE and (label, summary) not in connected_consequences:
-                if self.is_connected_to_value((label, summary), causal_relationships):
-                    logger.info(
-                        f"Indirect Value relationship found for: {summary}")
-                    connected_consequences.add((label, summary))
+        connected_to_values = self._consequences_connected_to_values(causal_relationships)
+        for consequence_key in consequence_elements - connected_consequences:
+            if consequence_key in connected_to_values:
+                logger.debug(
+                    "Indirect Value relationship found for: %s", consequence_key[1])
+                connected_consequences.add(consequence_key)
 
         # Filter elements: Keep Values and (directly or indirectly) connected Consequences
         filtered_elements = []
@@ -338,14 +368,58 @@ class CausalRelationshipProcessor:
                 # Keep Attributes and other non-Consequences
                 filtered_elements.append(elem)
             else:
-                logger.info(
-                    f"Removing unconnected Consequence: '{summary}' (no direct or indirect relationship to Values)")
+                logger.debug(
+                    "Removing unconnected Consequence: '%s' (no direct or indirect relationship to Values)",
+                    summary)
 
         logger.info(
-            f"After Value prioritization: {len(filtered_elements)} elements remain")
+            "After Value prioritization: %d elements remain", len(filtered_elements))
 
         return filtered_elements
 
+    async def _process_targets_without_parent(self, case_tag, target_keys, elements_map,
+                                              node_creator, processed_nodes, all_processed_nodes,
+                                              end_nodes_keys, final_nodes, **kwargs):
+        """
+        Creates the new target elements of an ignored source element without a parent node.
+
+        Args:
+            case_tag: Name of the special case, used for logging
+            target_keys: The keys of the target elements
+            elements_map: Mapping of label -> summary -> element
+            node_creator: Function to create or reuse nodes
+            processed_nodes: Map of already processed nodes
+            all_processed_nodes: List of all processed nodes
+            end_nodes_keys: Set of keys for end nodes
+            final_nodes: List of nodes to return
+            **kwargs: Passed through to node_creator
+        """
+        for target_key in target_keys:
+            target_label, target_summary = target_key
+
+            # Check if target element is new
+            target_elem = elements_map.get(target_label, {}).get(target_summary)
+            # target_elem[2] is is_new_element
+            if not target_elem or not target_elem[2]:
+                logger.debug(
+                    "Skipping target element (%s): %s - '%s' - not new or not found",
+                    case_tag, target_label.value, target_summary)
+                continue
+
+            logger.debug(
+                "Processing target element without parent (%s): %s - '%s'",
+                case_tag, target_label.value, target_summary)
+            # Without parent_node! Awaited one after another: each creation checks the
+            # tree for similar nodes, including the ones created for earlier targets
+            target_node = await node_creator(target_label, target_summary, **kwargs)
+            if target_node:
+                processed_nodes[target_key] = target_node
+                all_processed_nodes.append((target_key, target_node))
+
+                # Only add end nodes to final_nodes list
+                if target_key in end_nodes_keys:
+                    final_nodes.append(target_node)
+
     async def process_source_element_special_cases(self, source_key, target_keys, elements_map,
                                                  node_creator, processed_nodes, all_processed_nodes,
                                                  end_nodes_keys, final_nodes, client=None, model=None,
@@ -356,7 +430,7 @@ class CausalRelationshipProcessor:
         Args:
             source_key: The key of the source element
             target_keys: The keys of the target elements
-            elements_map: Mapping of element keys to elements
+            elements_map: Mapping of label -> summary -> element
             node_creator: Function to create or reuse nodes
             processed_nodes: Map of already processed nodes
             all_processed_nodes: List of all processed nodes
@@ -369,97 +443,43 @@ class CausalRelationshipProcessor:
         source_label, source_summary = source_key
     
         # Check if the element is new
-        source_elem = elements_map.get(source_key)
+        source_elem = elements_map.get(source_label, {}).get(source_summary)
         # source_elem[2] is is_new_element
-        if not source_elem or not source_elem[2]:
-            # Check if we should perform special handling despite "not new"
-            active_node = self.tree.active if self.tree else None
-    
-            if not active_node:
-                return False
-    
-            active_label = active_node.get_label()
-    
-            # Case 1: Active node is A and source element is A or C
-            if active_label == NodeLabel.ATTRIBUTE and (source_label == NodeLabel.ATTRIBUTE or source_label == NodeLabel.CONSEQUENCE):
-                logger.info(
-                    f"Source element ignored, but target elements without parent nodes processed: {source_label.value} - '{source_summary}'")
-    
-                # Process all target elements without the parent node
-                for target_key in target_keys:
-                    target_label, target_summary = target_key
-    
-                    # Check if target element is new
-                    target_elem = elements_map.get(target_key)
-                    # target_elem[2] is is_new_element
-                    if not target_elem or not target_elem[2]:
-                        logger.info(
-                            f"Skipping target element (Case 1): {target_label.value} - '{target_summary}' - not new or not found")
-                        continue
-    
-                    logger.info(
-                        f"Processing target element without parent (Case 1): {target_label.value} - '{target_summary}'")
-                    # Without parent_node! ADDED AWAIT HERE ↓
-                    target_node = await node_creator(target_label, target_summary,
-                                               client=client, model=model,
-                                               topic=topic, stimulus=stimulus,
-                                               interaction_id=interaction_id)
-                    if target_node:
-                        processed_nodes[target_key] = target_node
-                        all_processed_nodes.append((target_key, target_node))
-    
-                        # Only add end nodes to final_nodes list
-                        if target_key in end_nodes_keys:
-                            final_nodes.append(target_node)
-    
-                return True  # Skip source element
-    
-            # Case 2: Active node is C and source element is C or V
-            elif active_label == NodeLabel.CONSEQUENCE and (source_label == NodeLabel.CONSEQUENCE or source_label == NodeLabel.VALUE):
-                logger.info(
-                    f"Source element ignored, but target elements without parent nodes processed: {source_label.value} - '{source_summary}'")
-    
-                # Process all target elements without the parent node
-                for target_key in target_keys:
-                    target_label, target_summary = target_key
-    
-                    # Check if target element is new
-                    target_elem = elements_map.get(target_key)
-                    # target_elem[2] is is_new_element
-                    if not target_elem or not target_elem[2]:
-                        logger.info(
-                            f"Skipping target element (Case 2): {target_label.value} - '{target_summary}' - not new or not found")
-                        continue
-    
-                    logger.info(
-                        f"Processing target element without parent (Case 2): {target_label.value} - '{target_summary}'")
-                    # Without parent_node! ADDED AWAIT HERE ↓
-                    target_node = await node_creator(target_label, target_summary,
-                                               client=client, model=model,
-                                               topic=topic, stimulus=stimulus,
-                                               interaction_id=interaction_id)
-                    if target_node:
-                        processed_nodes[target_key] = target_node
-                        all_processed_nodes.append((target_key, target_node))
-    
-                        # Only add end nodes to final_nodes list
-                        if target_key in end_nodes_keys:
-                            final_nodes.append(target_node)
-    
-                return True  # Skip source element
-    
-            # Case 3: Active node is C and source element is A - skip as before
-            elif active_label == NodeLabel.CONSEQUENCE and source_label == NodeLabel.ATTRIBUTE:
-                logger.info(
-                    f"New consequences found in different context (active: C, source: A)")
-    
-                # List all associated target elements being ignored
-                for target_key in target_keys:
-                    target_label, target_summary = target_key
-                    logger.info(
-                        f"   ↳ Ignoring dependent element: {target_label.value} - '{target_summary}'")
-    
-                return True  # Skip source element
-    
-        # Default case: No special handling required
-        return False
+        if source_elem and source_elem[2]:
+            # Default case: No special handling required
+            return False
+
+        # Check if we should perform special handling despite "not new"
+        active_node = self.tree.active if self.tree else None
+        if not active_node:
+            return False
+
+        special_case = self.SPECIAL_CASES.get((active_node.get_label(), source_label))
+        if special_case is None:
+            # Default case: No special handling required
+            return False
+
+        if special_case == self.IGNORE_DEPENDENTS:
+            logger.info(
+                "New consequences found in different context (active: C, source: A)")
+
+            # List all associated target elements being ignored
+            for target_key in target_keys:
+                target_label, target_summary = target_key
+                logger.debug(
+                    "   ↳ Ignoring dependent element: %s - '%s'", target_label.value, target_summary)
+
+            return True  # Skip source element
+
+        logger.info(
+            "Source element ignored, but target elements without parent nodes processed: %s - '%s'",
+            source_label.value, source_summary)
+
+        # Process all target elements without the parent node
+        await self._process_targets_without_parent(
+            special_case, target_keys, elements_map, node_creator,
+            processed_nodes, all_processed_nodes, end_nodes_keys, final_nodes,
+            client=client, model=model, topic=topic, stimulus=stimulus,
+            interaction_id=interaction_id)
+
+        return True  # Skip source element
@@ -3,17 +3,128 @@ Element Analyzer module for analyzing user inputs in the context of the ACV ladd
 Specializes in identifying and categorizing elements like attributes, consequences, and values.
 """
 
+import asyncio
+import hashlib
 import logging
-from typing import Tuple, Dict, List, Any, Optional, Union
+import time
+from collections import OrderedDict
+from typing import Tuple, Dict, List, Any, Final, NamedTuple, Optional, Union
 
+import orjson
+
+from app.llm.client import LlmClient
 from app.llm.template_store import render_template
+from app.llm.utils import clean_json_response
 from app.interview.interview_tree.node_label import NodeLabel
+from app.interview.interview_tree.node_utils import NodeUtils
 from app.interview.interview_tree.tree import Tree
 from app.interview.interview_tree.tree_utils import TreeUtils
 from app.interview.analysis.similarity_analyzer import SimilarityAnalyzer
 
 logger = logging.getLogger(__name__)
 
+# Minimum summary length for IRRELEVANT answers, which may be shorter than other elements
+_MIN_IRRELEVANT_LENGTH: Final = 3
+
+# Prompt strings of the node labels, avoids the Enum.value descriptor on the hot path
+_LABEL_STR = {label: label.value for label in NodeLabel}
+_LABEL_STR[None] = "UNKNOWN"
+
+# JSON schemas for the expected LLM responses, built once. Passed to the LLM client as-is, never mutated.
+_IDEA_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "is_idea": {"type": "boolean"},
+        "summary": {"type": "string"},
+        "is_relevant": {"type": "boolean"}
+    },
+    "required": ["is_idea", "summary", "is_relevant"]
+}
+
+_JUDGE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "contains_multiple_elements": {"type": "boolean"},
+        "elements": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "category": {"type": "string", "enum": ["ATTRIBUTE", "CONSEQUENCE", "VALUE", "IRRELEVANT"]},
+                    "summary": {"type": "string"},
+                    "text_segment": {"type": "string"},
+                    "is_new_element": {"type": "boolean"}
+                },
+                "required": ["category", "summary", "text_segment", "is_new_element"]
+            }
+        },
+        "causal_relationships": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "source_element_index": {"type": "integer"},
+                    "target_element_index": {"type": "integer"},
+                    "relationship_type": {"type": "string", "enum": ["A→C", "C→C", "C→V"]},
+                    "explanation": {"type": "string"}
+                },
+                "required": ["source_element_index", "target_element_index", "relationship_type"]
+            }
+        }
+    },
+    "required": ["contains_multiple_elements", "elements"]
+}
+
+# Parsed LLM responses, keyed by a digest of (template, provider, model, template variables).
+# Short answers like "yes" or "not sure" recur often, a hit skips the LLM round-trip entirely.
+RESPONSE_CACHE_MAX_SIZE = 10_000
+RESPONSE_CACHE_TTL_SECONDS = 3600
+_response_cache: OrderedDict[bytes, tuple[dict, float]] = OrderedDict()
+# Requests currently waiting for the LLM, so concurrent duplicates share a single call
+_inflight_responses: Dict[bytes, asyncio.Future] = {}
+
+# Interview contexts built from the tree, keyed by (tree id, tree version, active node id, last question).
+# Shared with the callers, must not be mutated.
+CONTEXT_CACHE_MAX_SIZE = 512
+_context_cache: OrderedDict[tuple, Dict[str, str]] = OrderedDict()
+
+
+def _response_cache_key(template_name: str, provider: str, model: str,
+                        template_vars: Dict[str, Any]) -> bytes:
+    normalized = dict(template_vars)
+    normalized["message"] = str(normalized.get("message", "")).strip().lower()
+    payload = orjson.dumps([template_name, provider, model, normalized], option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+
+def _get_cached_response(key: bytes) -> Optional[dict]:
+    entry = _response_cache.get(key)
+    if entry is None:
+        return None
+
+    parsed, expires_at = entry
+    if expires_at <= time.monotonic():
+        del _response_cache[key]
+        return None
+
+    _response_cache.move_to_end(key)
+    return parsed
+
+
+def _cache_response(key: bytes, parsed: dict) -> None:
+    _response_cache[key] = (parsed, time.monotonic() + RESPONSE_CACHE_TTL_SECONDS)
+    _response_cache.move_to_end(key)
+    while len(_response_cache) > RESPONSE_CACHE_MAX_SIZE:
+        _response_cache.popitem(last=False)
+
+
+class _RecognizedElement(NamedTuple):
+    """Element accepted from an LLM response, referenced by index in causal relationships."""
+    index: int
+    label: NodeLabel
+    summary: str
+    element: Tuple[NodeLabel, str, str, bool]
+
 
 class ElementAnalyzer:
     """
@@ -27,12 +138,35 @@ class ElementAnalyzer:
     # Maximum character length for summaries
     MAX_SUMMARY_LENGTH = 50
 
-    # Storage for detected causal relationships
-    causal_relationships = []
-    
+    # Answer messages without content, or listed as IRRELEVANT by the prompts, without an LLM call
+    ENABLE_TRIVIAL_SHORTCIRCUIT = True
+    # Greetings and bare acknowledgements, compared after lower-casing and stripping punctuation
+    TRIVIAL_MESSAGES = frozenset({
+        "ok", "okay", "k", "yes", "yeah", "yep", "no", "nope", "hi", "hello", "hey", "thanks", "thank you",
+    })
+
+    # LLM response categories and the node labels they map to
+    _CATEGORY_TO_LABEL = {
+        "ATTRIBUTE": NodeLabel.ATTRIBUTE,
+        "CONSEQUENCE": NodeLabel.CONSEQUENCE,
+        "VALUE": NodeLabel.VALUE,
+        "IRRELEVANT": NodeLabel.IRRELEVANT_ANSWER,
+    }
+
+    # Allowed (relationship_type, source_label, target_label) combinations
+    _VALID_RELATIONS = frozenset({
+        ("A→C", NodeLabel.ATTRIBUTE, NodeLabel.CONSEQUENCE),
+        ("C→C", NodeLabel.CONSEQUENCE, NodeLabel.CONSEQUENCE),
+        ("C→V", NodeLabel.CONSEQUENCE, NodeLabel.VALUE),
+    })
+
     # Template name constants
     TEMPLATE_IDEA_CHECK = "idea_check"
     TEMPLATE_NODE_TYPE_ANALYSIS = "node_type_analysis"
+    # Dynamic context of the templates above, sent as user message so the
+    # static system prompt stays an identical prefix for provider prompt caching
+    TEMPLATE_IDEA_CHECK_CONTEXT = "idea_check_context"
+    TEMPLATE_NODE_TYPE_ANALYSIS_CONTEXT = "node_type_analysis_context"
 
     @classmethod
     def _build_context_from_tree(cls, interview_tree: Optional['Tree'],
@@ -63,30 +197,9 @@ class ElementAnalyzer:
         if effective_active_node:
             # Use explicitly provided effective active node
             active_node = effective_active_node
-        elif interview_tree.active:
-            # Automatic determination: If active node is irrelevant, use parent
-            active_node = interview_tree.active
-            if active_node.get_label() == NodeLabel.IRRELEVANT_ANSWER:
-                logger.debug(
-                    f"Active node is IRRELEVANT (ID: {active_node.id}) - using parent")
-
-                # Get parent of irrelevant node
-                parents = active_node.get_parents()
-                if parents:
-                    active_node = parents[0]  # Use first parent
-                    logger.debug(
-                        f"Using parent node for context: {active_node.id} - {active_node.get_label().value}")
-                else:
-                    # Fallback: If no parent, use root or set to None
-                    if interview_tree.get_tree_root():
-                        active_node = interview_tree.get_tree_root()
-                        logger.debug(
-                            f"No parent found, using root: {active_node.id} - {active_node.get_label().value}")
-                    else:
-                        active_node = None
-                        logger.debug("No parent or root found")
         else:
-            active_node = None
+            # Automatic determination: If active node is irrelevant, use parent
+            active_node = TreeUtils.resolve_effective_active(interview_tree)[0]
 
         if not active_node:
             return {
@@ -95,42 +208,145 @@ class ElementAnalyzer:
                 "last_question": last_question or ""
             }
 
+        # The context only changes with the tree contents, so reuse it until any node is modified
+        cache_key = (id(interview_tree), interview_tree.version, active_node.id, last_question)
+        cached = _context_cache.get(cache_key)
+        if cached is not None:
+            _context_cache.move_to_end(cache_key)
+            return cached
+
         # Enhanced active_node_info with context
-        active_node_info = f"{active_node.get_label().value}: {active_node.get_conclusion()}"
+        active_node_info = f"{_LABEL_STR[active_node.get_label()]}: {active_node.get_conclusion()}"
 
         # Optimized path building with newest parent nodes, but without irrelevant nodes
         path_nodes = TreeUtils.build_optimized_path_excluding_irrelevant(
             interview_tree, active_node)
 
-        # Filter out AUTO-generated nodes
-        from app.interview.interview_tree.node_utils import NodeUtils
-        filtered_path_nodes = []
+        # Filter out AUTO-generated nodes, keeping (label value, conclusion) of the others
+        filtered_path_entries = []
         for node_obj in path_nodes:
-            conclusion = node_obj.get_conclusion() or ""
-            if not NodeUtils.is_auto_generated(conclusion):
-                filtered_path_nodes.append(node_obj)
-
-        # Format path with hierarchical indentations
-        if filtered_path_nodes:
-            # Reverse so hierarchy goes from root down
-            reversed_path = list(reversed(filtered_path_nodes))
-
-            # Formatted path entries with hierarchy indicators
-            formatted_path = []
-            for i, node_obj in enumerate(reversed_path):
-                prefix = "└─" * i  # Hierarchy indicator
-                entry = f"{prefix}{node_obj.get_label().value}: {node_obj.get_conclusion()}"
-                formatted_path.append(entry)
-
-            interview_context = "\n".join(formatted_path)
-        else:
-            interview_context = ""
+            label, conclusion = node_obj.get_label_and_conclusion()
+            if not NodeUtils.is_auto_generated(conclusion or ""):
+                filtered_path_entries.append((_LABEL_STR[label], conclusion))
+
+        # Format path with hierarchical indentations, reversed so hierarchy goes from root down.
+        # Each entry is written directly into the join, without an intermediate list.
+        interview_context = "\n".join(
+            f"{'└─' * depth}{label_value}: {conclusion}"
+            for depth, (label_value, conclusion) in enumerate(reversed(filtered_path_entries))
+        )
 
-        return {
+        context = {
             "interview": interview_context,
             "active_node_info": active_node_info,
             "last_question": last_question or ""
         }
+        _context_cache[cache_key] = context
+        while len(_context_cache) > CONTEXT_CACHE_MAX_SIZE:
+            _context_cache.popitem(last=False)
+        return context
+
+    @classmethod
+    async def _query_structured_cached(cls, llm_client: Any, template_name: str,
+                                       context_template_name: str,
+                                       template_vars: Dict[str, Any],
+                                       json_schema: Dict[str, Any]) -> dict:
+        """
+        Returns the parsed LLM response for a template, served from the response cache when possible.
+        Concurrent identical requests share a single LLM call.
+
+        Args:
+            llm_client: LlmClient used for the request
+            template_name: Name of the static system prompt template
+            context_template_name: Name of the template for the dynamic user message
+            template_vars: Variables for the context template
+            json_schema: JSON schema for the expected response
+
+        Returns:
+            Parsed response data (shared with the cache, must not be mutated)
+        """
+        key = _response_cache_key(template_name, llm_client.provider, llm_client.model or "", template_vars)
+        cached = _get_cached_response(key)
+        if cached is not None:
+            logger.debug("LLM response cache hit for template %s", template_name)
+            return cached
+
+        task = _inflight_responses.get(key)
+        if task is None:
+            task = asyncio.create_task(
+                cls._query_structured(llm_client, template_name, context_template_name,
+                                      template_vars, json_schema, key)
+            )
+            _inflight_responses[key] = task
+            task.add_done_callback(lambda done: cls._finish_inflight(key, done))
+
+        # Shield so a cancelled caller does not cancel the request other callers are waiting for
+        return await asyncio.shield(task)
+
+    @staticmethod
+    def _finish_inflight(key: bytes, task: asyncio.Task) -> None:
+        _inflight_responses.pop(key, None)
+        # Retrieve the exception so asyncio does not warn when every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    @classmethod
+    async def _query_structured(cls, llm_client: Any, template_name: str,
+                                context_template_name: str,
+                                template_vars: Dict[str, Any],
+                                json_schema: Dict[str, Any], cache_key: bytes) -> dict:
+        """
+        Renders the templates, queries the LLM and parses the JSON response into the response cache.
+
+        Args:
+            llm_client: LlmClient used for the request
+            template_name: Name of the static system prompt template
+            context_template_name: Name of the template for the dynamic user message
+            template_vars: Variables for the context template
+            json_schema: JSON schema for the expected response
+            cache_key: Response cache key of the request
+
+        Returns:
+            Parsed response data
+        """
+        # Static instructions first, so providers can reuse the cached prompt prefix
+        messages = [
+            {"role": "system", "content": render_template(template_name)},
+            {"role": "user", "content": render_template(context_template_name, **template_vars)},
+        ]
+
+        raw_response = await llm_client.query_with_structured_output(
+            messages=messages,
+            schema=json_schema,
+            temperature=0.2  # Lower temperature for more consistent analysis
+        )
+
+        cleaned_json = clean_json_response(raw_response)
+        parsed_data = orjson.loads(cleaned_json)
+
+        # clean_json_response falls back to an error object, which must not be cached
+        if isinstance(parsed_data, dict) and "error" not in parsed_data:
+            _cache_response(cache_key, parsed_data)
+        return parsed_data
+
+    @classmethod
+    def _is_trivial_message(cls, message: str) -> bool:
+        """
+        Checks if a message cannot contain any element: empty, without letters or digits,
+        or a greeting/acknowledgement that the prompts classify as IRRELEVANT anyway.
+
+        Args:
+            message: User message
+
+        Returns:
+            True if the LLM call can be skipped
+        """
+        if not cls.ENABLE_TRIVIAL_SHORTCIRCUIT:
+            return False
+        normalized = message.strip().lower().rstrip(".!?")
+        if not any(char.isalnum() for char in normalized):
+            return True
+        return normalized in cls.TRIVIAL_MESSAGES
 
     @classmethod
     async def check_idea(cls, message: str, client: Any, model: str,
@@ -150,9 +366,11 @@ class ElementAnalyzer:
         Returns:
             Tuple of (is_idea, summary, is_relevant)
         """
-        from app.llm.client import LlmClient
-        
-        logger.info(f"Check_idea called with message: '{message[:50]}...'")
+        logger.info("Check_idea called with message: '%s...'", message[:50])
+
+        if cls._is_trivial_message(message):
+            logger.info("Trivial message, skipping idea check")
+            return (False, message.strip(), False)
         
         # Prepare template variables
         template_vars = {
@@ -165,38 +383,13 @@ class ElementAnalyzer:
         # Use LLM client
         llm_client = LlmClient(client, model)
         
-        # JSON schema for expected response
-        json_schema = {
-            "type": "object",
-            "properties": {
-                "is_idea": {"type": "boolean"},
-                "summary": {"type": "string"},
-                "is_relevant": {"type": "boolean"},
-                "explanation": {"type": "string"}
-            },
-            "required": ["is_idea", "summary", "is_relevant", "explanation"]
-        }
-        
-        # Use class variable for template name
-        system_prompt = render_template(cls.TEMPLATE_IDEA_CHECK, **template_vars)
-        
         try:
-            # Prepare messages for LLM request
-            messages = [{"role": "system", "content": system_prompt}]
-            
-            # Use standardized structured output method with optimal parameters for Groq
-            raw_response = await llm_client.query_with_structured_output(
-                messages=messages,
-                schema=json_schema,
-                temperature=0.2  # Lower temperature for more consistent analysis
+            # Use class variable for template name
+            parsed_data = await cls._query_structured_cached(
+                llm_client, cls.TEMPLATE_IDEA_CHECK, cls.TEMPLATE_IDEA_CHECK_CONTEXT,
+                template_vars, _IDEA_SCHEMA
             )
             
-            # Parse the response
-            import json
-            from app.llm.utils import clean_json_response
-            cleaned_json = clean_json_response(raw_response)
-            parsed_data = json.loads(cleaned_json)
-            
             # Extract results
             is_idea = parsed_data.get("is_idea", False)
             summary = parsed_data.get("summary", "")
@@ -204,16 +397,16 @@ class ElementAnalyzer:
             
             # Log the results
             if is_idea:
-                logger.info(f"IDEA detected: '{summary}'")
+                logger.info("IDEA detected: '%s'", summary)
             elif is_relevant:
-                logger.info(f"Relevant but not an IDEA: '{summary}'")
+                logger.info("Relevant but not an IDEA: '%s'", summary)
             else:
-                logger.info(f"IRRELEVANT response: '{summary}'")
+                logger.info("IRRELEVANT response: '%s'", summary)
                 
             return (is_idea, summary, is_relevant)
             
         except Exception as e:
-            logger.exception(f"Error in idea check: {e}")
+            logger.exception("Error in idea check: %s", e)
             return (False, f"Error: {str(e)}", False)
     
     @classmethod
@@ -237,46 +430,17 @@ class ElementAnalyzer:
             Tuple of (elements_list, causal_relationships)
             where elements_list is a list of (NodeLabel, summary, text_segment, is_new_element)
         """
-        from app.llm.client import LlmClient
+        logger.info("Judge_multi called with message: '%s...'", message[:50])
+
+        if cls._is_trivial_message(message):
+            logger.info("Trivial message, skipping multi-element analysis")
+            summary = f"Irrelevant: {message.strip()}"
+            if len(summary) > cls.MAX_SUMMARY_LENGTH:
+                summary = f"{summary[:cls.MAX_SUMMARY_LENGTH - 3]}..."
+            return [(NodeLabel.IRRELEVANT_ANSWER, summary, message.strip(), True)], []
         
-        logger.info(f"Judge_multi called with message: '{message[:50]}...'")
-        
-        # Determine active node and label (for context check)
-        active_node = None
-        active_label = None
-        active_node_label_str = "UNKNOWN"  # Default value
-        effective_active_node = None  # Node actually used for prompting
-        
-        if interview_tree and interview_tree.active:
-            active_node = interview_tree.active
-            active_label = active_node.get_label()
-            
-            # If active node is irrelevant, use parent
-            if active_label == NodeLabel.IRRELEVANT_ANSWER:
-                logger.debug(f"Active node is IRRELEVANT (ID: {active_node.id}) - using parent for prompting")
-                
-                # Get parent of irrelevant node
-                latest_parent = active_node.get_latest_parent()
-                if latest_parent:
-                    effective_active_node = latest_parent  # Use parent with highest ID
-                    active_label = effective_active_node.get_label()
-                    active_node_label_str = active_label.value if active_label else "UNKNOWN"
-                    logger.debug(f"Using parent node for prompting: {effective_active_node.id} - {active_label.value}")
-                else:
-                    # Fallback: If no parent, use root or set to None
-                    if interview_tree.get_tree_root():
-                        effective_active_node = interview_tree.get_tree_root()
-                        active_label = effective_active_node.get_label()
-                        active_node_label_str = active_label.value if active_label else "UNKNOWN"
-                        logger.debug(f"No parent found, using root: {effective_active_node.id} - {active_label.value}")
-                    else:
-                        effective_active_node = None
-                        active_node_label_str = "UNKNOWN"
-                        logger.debug(f"No parent or root found")
-            else:
-                # Normal case: Active node is not irrelevant
-                effective_active_node = active_node
-                active_node_label_str = active_label.value if active_label else "UNKNOWN"
+        # Node actually used for prompting: an IRRELEVANT active node is replaced by its parent
+        effective_active_node, _, active_node_label_str = TreeUtils.resolve_effective_active(interview_tree)
         
         # Build context from tree
         context_info = cls._build_context_from_tree(
@@ -299,80 +463,35 @@ class ElementAnalyzer:
         # Use LLM client
         llm_client = LlmClient(client, model)
         
-        # Define JSON schema for expected response
-        json_schema = {
-            "type": "object",
-            "properties": {
-                "contains_multiple_elements": {"type": "boolean"},
-                "elements": {
-                    "type": "array",
-                    "items": {
-                        "type": "object",
-                        "properties": {
-                            "category": {"type": "string", "enum": ["ATTRIBUTE", "CONSEQUENCE", "VALUE", "IRRELEVANT"]},
-                            "summary": {"type": "string"},
-                            "text_segment": {"type": "string"},
-                            "is_new_element": {"type": "boolean"}
-                        },
-                        "required": ["category", "summary", "text_segment", "is_new_element"]
-                    }
-                },
-                "causal_relationships": {
-                    "type": "array",
-                    "items": {
-                        "type": "object",
-                        "properties": {
-                            "source_element_index": {"type": "integer"},
-                            "target_element_index": {"type": "integer"},
-                            "relationship_type": {"type": "string", "enum": ["A→C", "C→C", "C→V"]},
-                            "explanation": {"type": "string"}
-                        },
-                        "required": ["source_element_index", "target_element_index", "relationship_type"]
-                    }
-                }
-            },
-            "required": ["contains_multiple_elements", "elements"]
-        }
-        
-        # Use class variable for template name
-        system_prompt = render_template(cls.TEMPLATE_NODE_TYPE_ANALYSIS, **template_vars)
-        
         try:
-            # Prepare messages for LLM request
-            messages = [{"role": "system", "content": system_prompt}]
-            
-            # Use the standardized structured output method for all providers
-            raw_response = await llm_client.query_with_structured_output(
-                messages=messages,
-                schema=json_schema,
-                temperature=0.2,  # Lower temperature for more consistent analysis
+            # Use class variable for template name
+            parsed_data = await cls._query_structured_cached(
+                llm_client, cls.TEMPLATE_NODE_TYPE_ANALYSIS, cls.TEMPLATE_NODE_TYPE_ANALYSIS_CONTEXT,
+                template_vars, _JUDGE_SCHEMA
             )
             
-            # Parse response
-            import json
-            from app.llm.utils import clean_json_response
-            cleaned_json = clean_json_response(raw_response)
-            parsed_data = json.loads(cleaned_json)
-            
             # Process LLM response with helper method
-            effective_active_label = effective_active_node.get_label() if effective_active_node else None
-            effective_active_conclusion = effective_active_node.get_conclusion() if effective_active_node else ""
+            if effective_active_node:
+                effective_active_label, effective_active_conclusion = effective_active_node.get_label_and_conclusion()
+            else:
+                effective_active_label, effective_active_conclusion = None, ""
             
-            result_elements = cls._process_llm_analysis_response(
+            result_elements, causal_relationships = cls._process_llm_analysis_response(
                 parsed_data, message, effective_active_label, effective_active_conclusion
             )
             
-            return result_elements, cls.causal_relationships
+            return result_elements, causal_relationships
             
         except Exception as e:
-            logger.exception(f"Error in multi-element analysis: {e}")
+            logger.exception("Error in multi-element analysis: %s", e)
             return [], []
 
 
     @classmethod
     def _process_llm_analysis_response(cls, parsed_data: dict, message: str, 
                                       active_label: Optional[NodeLabel] = None, 
-                                      active_conclusion: str = "") -> List[Tuple[NodeLabel, str, str, bool]]:
+                                      active_conclusion: str = ""
+                                      ) -> Tuple[List[Tuple[NodeLabel, str, str, bool]], List[dict]]:
         """
         Processes parsed JSON response from LLM and extracts elements and causal relationships.
         
@@ -383,7 +502,8 @@ class ElementAnalyzer:
             active_conclusion: Summary of active node
             
         Returns:
-            List of tuples [(NodeLabel, summary, text_segment, is_new_element), ...]
+            Tuple of (elements_list, causal_relationships)
+            where elements_list is a list of [(NodeLabel, summary, text_segment, is_new_element), ...]
         """
         # Extract elements
         elements_data = parsed_data.get("elements", [])
@@ -391,6 +511,14 @@ class ElementAnalyzer:
         
         # Storage for recognized elements (for later relationship mapping)
         recognized_elements = []
+
+        # Limits read once from the class (so subclasses and patches still apply), not per element
+        min_length = cls.MIN_RESPONSE_LENGTH
+        min_irrelevant_length = _MIN_IRRELEVANT_LENGTH
+        max_summary_length = cls.MAX_SUMMARY_LENGTH
+        # Cut position for truncated summaries, leaves room for the "..." suffix
+        summary_cut = max_summary_length - 3
+        category_to_label = cls._CATEGORY_TO_LABEL
         
         # After parsing elements, check if they're new or repetitions
         for elem in elements_data:
@@ -400,92 +528,77 @@ class ElementAnalyzer:
             category = elem.get("category", "")
             if not category:
                 continue
-            
-            # If IRRELEVANT, create IRRELEVANT_ANSWER element
-            if category == "IRRELEVANT":
-                logger.info(f"Message identified as irrelevant: {elem.get('summary', 'No reason')}")
-                node_label = NodeLabel.IRRELEVANT_ANSWER
+
+            node_label = category_to_label.get(category) if isinstance(category, str) else None
+            if node_label is None:
+                logger.warning("Unknown category: %s", category)
+                continue
+
+            summary = elem.get("summary", "").strip()
+            text_segment = elem.get("text_segment", message).strip()
+
+            if node_label is NodeLabel.IRRELEVANT_ANSWER:
+                logger.info("Message identified as irrelevant: %s", elem.get("summary", "No reason"))
                 # For irrelevant answers, is_new is always True
                 is_new = True
-                summary = elem.get("summary", "").strip()
-            elif category == "ATTRIBUTE":
-                node_label = NodeLabel.ATTRIBUTE
-                is_new = elem.get("is_new_element", True)
-                summary = elem.get("summary", "").strip()
-            elif category == "CONSEQUENCE":
-                # Check if consequence is in context of active consequence
-                if active_label == NodeLabel.CONSEQUENCE:
-                    # Extract summary
-                    consequence_summary = elem.get("summary", "").strip()
-                    
-                    # Consequence is relevant to active consequence -> process normally
-                    node_label = NodeLabel.CONSEQUENCE
-                    is_new = elem.get("is_new_element", True)
-                    summary = consequence_summary
-                    logger.info(f"Consequence '{summary}' is always relevant to active consequence '{active_conclusion}'")
-                else:
-                    # Normal case: No active consequence
-                    node_label = NodeLabel.CONSEQUENCE
-                    is_new = elem.get("is_new_element", True)
-                    summary = elem.get("summary", "").strip()
-            elif category == "VALUE":
-                node_label = NodeLabel.VALUE
-                is_new = elem.get("is_new_element", True)
-                summary = elem.get("summary", "").strip()
             else:
-                logger.warning(f"Unknown category: {category}")
-                continue
-            
-            text_segment = elem.get("text_segment", message).strip()
-            
+                is_new = elem.get("is_new_element", True)
+                # Consequences are always relevant to an active consequence
+                if node_label is NodeLabel.CONSEQUENCE and active_label == NodeLabel.CONSEQUENCE:
+                    logger.info("Consequence '%s' is always relevant to active consequence '%s'",
+                                summary, active_conclusion)
+
             # For IRRELEVANT_ANSWER also accept shorter summaries
-            min_length = 3 if node_label == NodeLabel.IRRELEVANT_ANSWER else cls.MIN_RESPONSE_LENGTH
+            required_length = min_irrelevant_length if node_label is NodeLabel.IRRELEVANT_ANSWER else min_length
             
-            if summary and len(summary) >= min_length:
+            if summary and len(summary) >= required_length:
                 # Shorten summary if needed
-                if len(summary) > cls.MAX_SUMMARY_LENGTH:
-                    summary = summary[:cls.MAX_SUMMARY_LENGTH-3] + "..."
+                if len(summary) > max_summary_length:
+                    summary = f"{summary[:summary_cut]}..."
                 
                 element_tuple = (node_label, summary, text_segment, is_new)
                 result_elements.append(element_tuple)
-                recognized_elements.append({
-                    "index": len(recognized_elements),
-                    "label": node_label,
-                    "summary": summary,
-                    "tuple": element_tuple
-                })
+                recognized_elements.append(
+                    _RecognizedElement(len(recognized_elements), node_label, summary, element_tuple)
+                )
         
         # Extract causal relationships
-        causal_relationships = parsed_data.get("causal_relationships", [])
+        raw_relationships = parsed_data.get("causal_relationships", [])
         
         # Process causal relationships
-        if causal_relationships:
-            cls._process_causal_relationships(causal_relationships, recognized_elements)
+        causal_relationships = []
+        if raw_relationships:
+            causal_relationships = cls._process_causal_relationships(raw_relationships, recognized_elements)
         
         # Log output for recognized elements
         element_count = len(result_elements)
         if element_count > 0:
-            logger.info(f"Multiple elements detected: {element_count}")
-            for i, (label, summary, _, is_new) in enumerate(result_elements):
-                new_flag = "" if is_new else " (Repetition)"
-                logger.info(f"Element {i+1}: {label.value} - {summary}{new_flag}")
+            logger.info("Multiple elements detected: %d", element_count)
+            # Skip the per-element loop entirely when INFO is disabled
+            if logger.isEnabledFor(logging.INFO):
+                for i, (label, summary, _, is_new) in enumerate(result_elements):
+                    new_flag = "" if is_new else " (Repetition)"
+                    logger.info("Element %d: %s - %s%s", i + 1, label.value, summary, new_flag)
         else:
             logger.info("No elements detected!")
         
-        return result_elements
+        return result_elements, causal_relationships
 
     @classmethod
     def _process_causal_relationships(cls, causal_relationships: List[dict],
-                                      recognized_elements: List[dict]) -> None:
+                                      recognized_elements: List[_RecognizedElement]) -> List[dict]:
         """
         Processes detected causal relationships between elements.
 
         Args:
             causal_relationships: List of detected causal relationships
             recognized_elements: List of detected elements with their indices
+
+        Returns:
+            List of valid relationships (source_element, target_element, relationship_type, explanation)
         """
-        # Store detected relationships in class
-        cls.causal_relationships = []
+        # Collected per call, concurrent analyses must not share this list
+        valid_relationships = []
 
         for rel in causal_relationships:
             source_idx = rel.get("source_element_index")
@@ -495,12 +608,12 @@ class ElementAnalyzer:
 
             # Check if indices are valid
             if source_idx is None or target_idx is None or source_idx == target_idx:
-                logger.warning(f"Invalid relationship found: {rel}")
+                logger.warning("Invalid relationship found: %s", rel)
                 continue
 
             if source_idx < 0 or source_idx >= len(recognized_elements) or \
                target_idx < 0 or target_idx >= len(recognized_elements):
-                logger.warning(f"Invalid index in relationship: {rel}")
+                logger.warning("Invalid index in relationship: %s", rel)
                 continue
 
             # Get involved elements
@@ -508,34 +621,26 @@ class ElementAnalyzer:
             target_element = recognized_elements[target_idx]
 
             # Validate relationship types based on element types
-            source_label = source_element["label"]
-            target_label = target_element["label"]
-
-            valid_relation = False
-            if rel_type == "A→C" and source_label == NodeLabel.ATTRIBUTE and target_label == NodeLabel.CONSEQUENCE:
-                valid_relation = True
-            elif rel_type == "C→C" and source_label == NodeLabel.CONSEQUENCE and target_label == NodeLabel.CONSEQUENCE:
-                valid_relation = True
-            elif rel_type == "C→V" and source_label == NodeLabel.CONSEQUENCE and target_label == NodeLabel.VALUE:
-                valid_relation = True
-
-            if valid_relation:
+            source_label = source_element.label
+            target_label = target_element.label
+
+            if isinstance(rel_type, str) and (rel_type, source_label, target_label) in cls._VALID_RELATIONS:
                 # Store relationship
                 relationship = {
-                    "source_element": source_element["tuple"],
-                    "target_element": target_element["tuple"],
+                    "source_element": source_element.element,
+                    "target_element": target_element.element,
                     "relationship_type": rel_type,
                     "explanation": explanation
                 }
-                cls.causal_relationships.append(relationship)
+                valid_relationships.append(relationship)
 
                 # Debug output for detected relationship
-                source_summary = source_element["summary"]
-                target_summary = target_element["summary"]
-                logger.debug(
-                    f"Causal relationship found ({rel_type}): '{source_summary}' → '{target_summary}'")
+                logger.debug("Causal relationship found (%s): '%s' → '%s'",
+                             rel_type, source_element.summary, target_element.summary)
                 if explanation:
-                    logger.debug(f"Explanation: {explanation}")
+                    logger.debug("Explanation: %s", explanation)
             else:
-                logger.warning(
-                    f"Invalid relationship type {rel_type} for {source_label.value} → {target_label.value}")
+                logger.warning("Invalid relationship type %s for %s → %s",
+                               rel_type, source_label.value, target_label.value)
+
+        return valid_relationships
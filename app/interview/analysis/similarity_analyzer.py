@@ -4,10 +4,16 @@ Provides functions for contextual and direct content similarity assessment.
 """
 
 import re
+import hashlib
 import logging
-from typing import List, Dict, Any, Optional
+import time
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Set, Tuple
+
+import orjson
 
 from app.llm.template_store import render_template
+from app.llm.utils import clean_json_response
 from app.interview.interview_tree.node_label import NodeLabel
 from app.interview.interview_tree.node_utils import NodeUtils
 from app.llm.client import LlmClient
@@ -15,6 +21,44 @@ from app.interview.interview_tree.tree_utils import TreeUtils
 
 logger = logging.getLogger(__name__)
 
+# (node id, label string, conclusion) of a path entry, read from the node once
+_PathEntry = Tuple[str, str, Optional[str]]
+
+# Words with at least 3 letters, compiled once for the pairwise similarity checks
+_WORD3_RE = re.compile(r'\b\w{3,}\b')
+
+# Parsed similarity results, keyed by a digest of (provider, model, rendered user prompt).
+# Re-asked or reformulated answers often produce the same node and candidate paths again.
+SIMILARITY_CACHE_MAX_SIZE = 1024
+SIMILARITY_CACHE_TTL_SECONDS = 3600
+_similarity_cache: OrderedDict[bytes, tuple[List[Dict[str, Any]], float]] = OrderedDict()
+
+
+def _similarity_cache_key(provider: str, model: str, context_prompt: str) -> bytes:
+    payload = "\0".join((provider, model, context_prompt)).encode()
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+
+def _get_cached_similarity(key: bytes) -> Optional[List[Dict[str, Any]]]:
+    entry = _similarity_cache.get(key)
+    if entry is None:
+        return None
+
+    results, expires_at = entry
+    if expires_at <= time.monotonic():
+        del _similarity_cache[key]
+        return None
+
+    _similarity_cache.move_to_end(key)
+    return results
+
+
+def _cache_similarity(key: bytes, results: List[Dict[str, Any]]) -> None:
+    _similarity_cache[key] = (results, time.monotonic() + SIMILARITY_CACHE_TTL_SECONDS)
+    _similarity_cache.move_to_end(key)
+    while len(_similarity_cache) > SIMILARITY_CACHE_MAX_SIZE:
+        _similarity_cache.popitem(last=False)
+
 
 class SimilarityAnalyzer:
     """
@@ -22,13 +66,19 @@ class SimilarityAnalyzer:
     Supports both content-based and context-aware similarity checks.
     """
     
-    # Template name constant
+    # Template name constants
     TEMPLATE_NODE_SIMILARITY_CHECK = "node_similarity_check"
+    # User turn with the per-call context; the system prompt stays static so providers can cache it as prefix
+    TEMPLATE_NODE_SIMILARITY_CHECK_CONTEXT = "node_similarity_check_context"
+
+    # Hierarchy indicators by depth, built once instead of per path entry
+    _INDENT = tuple("└─" * i for i in range(64))
 
     @classmethod
     async def check_contextual_similarity(cls, new_node: 'Node', merge_candidates: List['Node'],
                                          tree_obj: 'Tree', client: Any,
-                                         model: str, topic: str, stimulus: str) -> List[Dict[str, Any]]:
+                                         model: str, topic: str, stimulus: str,
+                                         path_cache: Optional[Dict[str, List[_PathEntry]]] = None) -> List[Dict[str, Any]]:
         """
         Performs a context-based similarity check with multiple candidates in parallel.
         Uses LLM to determine if nodes are similar enough to merge based on their context paths.
@@ -41,6 +91,8 @@ class SimilarityAnalyzer:
             model: Model to use
             topic: Interview topic
             stimulus: Interview stimulus
+            path_cache: Optional filtered paths by node id; pass the same dict to chained
+                checks on an unchanged tree to reuse the paths
         
         Returns:
             List of dictionaries with similarity check results
@@ -53,45 +105,19 @@ class SimilarityAnalyzer:
                      "explanation": "The new node is None"}
                     for candidate in merge_candidates]
         
-        # Extract path for new node with optimized path building
-        new_node_path = TreeUtils.build_optimized_path_excluding_irrelevant(
-            tree_obj, new_node)
-        
-        # Filter out AUTO-generated nodes
-        new_node_path_filtered = []
-        for n in new_node_path:
-            conclusion = n.get_conclusion() or ""
-            if not NodeUtils.is_auto_generated(conclusion):
-                new_node_path_filtered.append(n)
+        # Filtered paths by node id, candidates share most of their ancestors
+        if path_cache is None:
+            path_cache = {}
         
         # Formatted path for new node
-        new_node_path_formatted = cls._format_node_path(new_node_path_filtered)
+        new_node_path_formatted = cls._build_filtered_path(tree_obj, new_node, path_cache)
         
         # Format candidates with their paths
-        candidates_formatted = ""
+        candidate_blocks: List[str] = []
         for i, candidate in enumerate(merge_candidates):
-            if not candidate:
-                continue
-        
-            # Extract path for candidate
-            candidate_path = TreeUtils.build_optimized_path_excluding_irrelevant(
-                tree_obj, candidate)
-        
-            # Filter out AUTO-generated nodes
-            candidate_path_filtered = []
-            for n in candidate_path:
-                conclusion = n.get_conclusion() or ""
-                if not NodeUtils.is_auto_generated(conclusion):
-                    candidate_path_filtered.append(n)
-        
-            # Formatted path for candidate
-            candidate_path_formatted = cls._format_node_path(
-                candidate_path_filtered)
-        
-            # Add candidate entry
-            candidates_formatted += f"CANDIDATE {i}:\n"
-            candidates_formatted += f"- Summary: \"{candidate.get_conclusion()}\"\n"
-            candidates_formatted += f"- Full context path (from element to root):\n{candidate_path_formatted}\n\n"
+            if candidate:
+                candidate_blocks.append(cls._build_candidate_block(tree_obj, i, candidate, path_cache))
+        candidates_formatted = "".join(candidate_blocks)
         
         # Prepare template variables
         template_vars = {
@@ -131,40 +157,24 @@ class SimilarityAnalyzer:
         }
         
         # Use class variable for template name
-        system_prompt = render_template(
-            cls.TEMPLATE_NODE_SIMILARITY_CHECK, **template_vars)
+        context_prompt = render_template(
+            cls.TEMPLATE_NODE_SIMILARITY_CHECK_CONTEXT, **template_vars)
         
         try:
-            # Prepare messages for LLM request
-            messages = [{"role": "system", "content": system_prompt}]
-            
-            # Use standardized structured output method
-            raw_response = await llm_client.query_with_structured_output(
-                messages=messages,
-                schema=json_schema,
-                temperature=0.1,  # Very low temperature for consistent similarity judgments
-            )
-            
-            # Parse the response
-            import json
-            from app.llm.utils import clean_json_response
-            cleaned_json = clean_json_response(raw_response)
-            parsed_data = json.loads(cleaned_json)
-            
-            similarity_results = parsed_data.get("similarity_results", [])
+            similarity_results = await cls._query_similarity_results(
+                llm_client, json_schema, context_prompt)
         
             # Connect results with actual candidate nodes
-            final_results = []
-            for result in similarity_results:
-                candidate_id = result.get("candidate_id", -1)
-                if 0 <= candidate_id < len(merge_candidates):
-                    candidate_node = merge_candidates[candidate_id]
-                    final_results.append({
-                        "candidate_node": candidate_node,
-                        "should_merge": result.get("should_merge", False),
-                        "explanation": result.get("explanation", ""),
-                        "confidence_score": result.get("confidence_score", 0)
-                    })
+            final_results, answered_ids = cls._match_similarity_results(
+                similarity_results, merge_candidates)
+        
+            # Re-issue only the candidates missing from a truncated batch response
+            missing_ids = [i for i, candidate in enumerate(merge_candidates)
+                           if candidate and i not in answered_ids]
+            if missing_ids:
+                final_results.extend(await cls._retry_missing_candidates(
+                    llm_client, json_schema, tree_obj, template_vars, merge_candidates, missing_ids,
+                    path_cache))
         
             logger.info(
                 f"Similarity check yielded {len(final_results)} results")
@@ -180,25 +190,200 @@ class SimilarityAnalyzer:
             } for candidate in merge_candidates]
 
     @classmethod
-    def _format_node_path(cls, path_nodes):
+    async def _query_similarity_results(cls, llm_client: LlmClient, json_schema: Dict[str, Any],
+                                        context_prompt: str) -> List[Dict[str, Any]]:
+        """
+        Sends a similarity check to the LLM and parses the per-candidate results.
+        The static instructions go first as system message, so the invariant prefix can be cached.
+
+        Args:
+            llm_client: LLM client
+            json_schema: JSON schema for the expected response
+            context_prompt: Rendered user turn with new node and candidates
+
+        Returns:
+            Raw list of similarity results as returned by the LLM, shared with the cache and not to be mutated
+        """
+        # The system prompt is static, so the user turn fully determines the request
+        cache_key = _similarity_cache_key(llm_client.provider, llm_client.model or "", context_prompt)
+        cached = _get_cached_similarity(cache_key)
+        if cached is not None:
+            logger.debug("Similarity cache hit")
+            return cached
+
+        # Prepare messages for LLM request
+        messages = [
+            {"role": "system", "content": render_template(cls.TEMPLATE_NODE_SIMILARITY_CHECK)},
+            {"role": "user", "content": context_prompt},
+        ]
+
+        # Use standardized structured output method
+        raw_response = await llm_client.query_with_structured_output(
+            messages=messages,
+            schema=json_schema,
+            temperature=0.1,  # Very low temperature for consistent similarity judgments
+        )
+
+        # Parse the response
+        cleaned_json = clean_json_response(raw_response)
+        parsed_data = orjson.loads(cleaned_json)
+
+        similarity_results = parsed_data.get("similarity_results", [])
+        # clean_json_response falls back to an error object; only cache real results,
+        # otherwise one bad reply would block merges for this prompt until the TTL expires
+        if "error" not in parsed_data and "similarity_results" in parsed_data:
+            _cache_similarity(cache_key, similarity_results)
+        return similarity_results
+
+    @staticmethod
+    def _match_similarity_results(similarity_results: List[Dict[str, Any]],
+                                  candidates: List['Node']) -> Tuple[List[Dict[str, Any]], Set[int]]:
+        """
+        Connects LLM similarity results with the candidate nodes they refer to.
+
+        Args:
+            similarity_results: Raw results with candidate_id indices into candidates
+            candidates: Candidate nodes in prompt order
+
+        Returns:
+            Tuple of (results with candidate nodes, set of answered candidate ids)
+        """
+        final_results = []
+        answered_ids = set()
+        for result in similarity_results:
+            candidate_id = result.get("candidate_id", -1)
+            if 0 <= candidate_id < len(candidates):
+                answered_ids.add(candidate_id)
+                final_results.append({
+                    "candidate_node": candidates[candidate_id],
+                    "should_merge": result.get("should_merge", False),
+                    "explanation": result.get("explanation", ""),
+                    "confidence_score": result.get("confidence_score", 0)
+                })
+        return final_results, answered_ids
+
+    @classmethod
+    async def _retry_missing_candidates(cls, llm_client: LlmClient, json_schema: Dict[str, Any],
+                                        tree_obj: 'Tree', template_vars: Dict[str, Any],
+                                        merge_candidates: List['Node'], missing_ids: List[int],
+                                        path_cache: Dict[str, List[_PathEntry]]) -> List[Dict[str, Any]]:
+        """
+        Renders the similarity prompt over only the candidates missing from the first response.
+
+        Args:
+            llm_client: LLM client
+            json_schema: JSON schema for the expected response
+            tree_obj: Interview tree
+            template_vars: Template variables of the original request
+            merge_candidates: All candidate nodes
+            missing_ids: Indices of candidates without a result
+            path_cache: Filtered paths by node id from the original request
+
+        Returns:
+            Similarity results for the retried candidates, empty if the retry fails
+        """
+        logger.info("Similarity response missed %d candidate(s), re-issuing only those", len(missing_ids))
+
+        # Candidates are re-indexed from 0 so the prompt's candidate range stays consistent
+        subset = [merge_candidates[i] for i in missing_ids]
+        retry_vars = dict(
+            template_vars,
+            candidates_formatted="".join(
+                cls._build_candidate_block(tree_obj, i, candidate, path_cache)
+                for i, candidate in enumerate(subset)),
+            num_candidates=len(subset),
+            num_candidates_minus_one=len(subset) - 1,
+        )
+
+        try:
+            similarity_results = await cls._query_similarity_results(
+                llm_client, json_schema, render_template(cls.TEMPLATE_NODE_SIMILARITY_CHECK_CONTEXT, **retry_vars))
+            retry_results, _ = cls._match_similarity_results(similarity_results, subset)
+            return retry_results
+        except Exception as e:
+            logger.warning("Retry for missing similarity candidates failed: %s", e)
+            return []
+
+    @classmethod
+    def _build_filtered_path(cls, tree_obj: 'Tree', node: 'Node', path_cache: Dict[str, List[_PathEntry]]) -> str:
+        """
+        Builds the formatted context path of a node, excluding irrelevant and AUTO-generated nodes.
+        Follows the same path as TreeUtils.build_optimized_path_excluding_irrelevant, but stops at
+        the first ancestor whose filtered path is already cached and reuses it as suffix.
+
+        Args:
+            tree_obj: Interview tree
+            node: Node whose path to the root is formatted
+            path_cache: Filtered path entries (node to root) by node id, filled on demand
+
+        Returns:
+            Formatted string representation of the path
+        """
+        if not tree_obj or not node:
+            return cls._format_node_path([])
+
+        # Walk up until the path of an ancestor is known
+        uncached = []
+        current = node
+        suffix: List[_PathEntry] = []
+        while current:
+            cached = path_cache.get(current.id)
+            if cached is not None:
+                suffix = cached
+                break
+            uncached.append(current)
+            current = TreeUtils.next_optimized_path_node(current)
+
+        # Extend the known suffix downwards, filtering out AUTO-generated nodes
+        for n in reversed(uncached):
+            conclusion = n.get_conclusion()
+            if not NodeUtils.is_auto_generated(conclusion or ""):
+                suffix = [(n.id, n.get_label().value, conclusion)] + suffix
+            path_cache[n.id] = suffix
+
+        return cls._format_node_path(suffix)
+
+    @classmethod
+    def _build_candidate_block(cls, tree_obj: 'Tree', index: int, candidate: 'Node',
+                               path_cache: Dict[str, List[_PathEntry]]) -> str:
+        """
+        Formats a single candidate entry for the similarity prompt.
+
+        Args:
+            tree_obj: Interview tree
+            index: Candidate id referenced in the LLM response
+            candidate: Candidate node
+            path_cache: Filtered paths by node id
+
+        Returns:
+            Formatted candidate block
+        """
+        candidate_path_formatted = cls._build_filtered_path(tree_obj, candidate, path_cache)
+        return (f"CANDIDATE {index}:\n"
+                f"- Summary: \"{candidate.get_conclusion()}\"\n"
+                f"- Full context path (from element to root):\n{candidate_path_formatted}\n\n")
+
+    @classmethod
+    def _format_node_path(cls, path_entries: List[_PathEntry]) -> str:
         """
         Formats a path of nodes for similarity checking.
         Creates a hierarchical representation with indentation.
 
         Args:
-            path_nodes: List of nodes in the path
+            path_entries: List of (node id, label string, conclusion) tuples in the path
 
         Returns:
             Formatted string representation of the path
         """
         # Reverse so hierarchy goes from root down
-        reversed_path = list(reversed(path_nodes))
+        reversed_path = list(reversed(path_entries))
 
         # Formatted path entries with hierarchy indicators
+        indent = cls._INDENT
         formatted = []
-        for i, n in enumerate(reversed_path):
-            prefix = "└─" * i  # Hierarchy indicator
-            entry = f"{prefix}{n.get_label().value}({n.id}): {n.get_conclusion()}"
+        for i, (node_id, label, conclusion) in enumerate(reversed_path):
+            prefix = indent[i] if i < len(indent) else "└─" * i  # Hierarchy indicator
+            entry = f"{prefix}{label}({node_id}): {conclusion}"
             formatted.append(entry)
 
         return "\n".join(formatted)
@@ -236,11 +421,8 @@ class SimilarityAnalyzer:
 
         # 3. Word set comparison with improved logic
         # Words with at least 3 letters
-        words1 = set(re.findall(r'\b\w{3,}\b', element1))
-        words2 = set(re.findall(r'\b\w{3,}\b', element2))
-
-        # Count common words
-        common_words = words1.intersection(words2)
+        words1 = set(_WORD3_RE.findall(element1))
+        words2 = set(_WORD3_RE.findall(element2))
 
         # Adjust thresholds based on element type
         word_match_threshold = 0.35  # Default threshold
@@ -263,21 +445,31 @@ class SimilarityAnalyzer:
 
         # Calculate Jaccard similarity
         if words1 or words2:  # Avoid division by zero
-            jaccard = len(common_words) / len(words1.union(words2))
+            len1, len2 = len(words1), len(words2)
 
             # Adjust Jaccard threshold based on text length
-            if len(words1) <= 3 and len(words2) <= 3:
+            if len1 <= 3 and len2 <= 3:
                 # For very short texts: One common word can be relevant
-                if len(common_words) >= min_common_words or jaccard >= (word_match_threshold - 0.1):
-                    return True
-            elif len(words1) <= 6 and len(words2) <= 6:
+                required_common, required_jaccard = min_common_words, word_match_threshold - 0.1
+            elif len1 <= 6 and len2 <= 6:
                 # For medium-length texts: Expect more match
-                if len(common_words) >= min_common_words or jaccard >= word_match_threshold:
-                    return True
+                required_common, required_jaccard = min_common_words, word_match_threshold
             else:
                 # For longer texts: Require even higher match
-                if len(common_words) >= (min_common_words + 1) or jaccard >= (word_match_threshold + 0.05):
-                    return True
+                required_common, required_jaccard = min_common_words + 1, word_match_threshold + 0.05
+
+            # At most the smaller set can be shared, which also bounds Jaccard by its length ratio.
+            # Skip the set operations when neither threshold is reachable.
+            lo, hi = (len1, len2) if len1 <= len2 else (len2, len1)
+            if lo < required_common and lo / hi < required_jaccard:
+                return False
+
+            # Count common words
+            common = len(words1 & words2)
+            jaccard = common / (len1 + len2 - common)
+
+            if common >= required_common or jaccard >= required_jaccard:
+                return True
 
         # No similarity found
         return False
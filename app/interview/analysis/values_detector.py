@@ -36,8 +36,7 @@ class ValuesDetector:
         if not tree:
             return False
 
-        value_nodes = tree.get_nodes_by_label(NodeLabel.VALUE)
-        current_values = len(value_nodes)
+        current_values = tree.count_nodes_by_label(NodeLabel.VALUE)
         limit_reached = current_values >= n_values_max
 
         if limit_reached:
@@ -62,8 +61,7 @@ class ValuesDetector:
         if not tree:
             return 0
 
-        value_nodes = tree.get_nodes_by_label(NodeLabel.VALUE)
-        value_count = len(value_nodes)
+        value_count = tree.count_nodes_by_label(NodeLabel.VALUE)
 
         logger.info(f"Current VALUE nodes in tree: {value_count}")
         return value_count
@@ -32,6 +32,10 @@ class InterviewStage(Enum):
     NO_STIMULI = "no_stimuli"
 
 
+# Stages by their serialized value, used when restoring sessions
+_STAGE_BY_VALUE = {stage.value: stage for stage in InterviewStage}
+
+
 class InterviewStateManager:
     """
     Manages the current state of the interview and determines the next steps.
@@ -50,12 +54,12 @@ class InterviewStateManager:
     def increment_message_count(self) -> None:
         """Increment the message counter."""
         self.message_count += 1
-        logger.debug(f"Message count incremented to {self.message_count}")
+        logger.debug("Message count incremented to %d", self.message_count)
 
     def increment_content_message_count(self) -> None:
         """Increment the content message counter."""
         self.content_message_count += 1
-        logger.debug(f"Content message count incremented to {self.content_message_count}")
+        logger.debug("Content message count incremented to %d", self.content_message_count)
 
     def is_first_message(self) -> bool:
         """Check if this is the first message."""
@@ -63,7 +67,7 @@ class InterviewStateManager:
 
     def set_stage(self, stage: InterviewStage) -> None:
         """Explicitly set the interview stage."""
-        logger.info(f"Interview stage changed from {self.stage.value} to {stage.value}")
+        logger.info("Interview stage changed from %s to %s", self.stage.value, stage.value)
         self.stage = stage
 
     def get_stage(self) -> InterviewStage:
@@ -90,11 +94,12 @@ class InterviewStateManager:
     def from_dict(cls, data: Dict[str, Any]) -> "InterviewStateManager":
         """Create an InterviewStateManager from a dictionary."""
         instance = cls()
-        try:
-            instance.stage = InterviewStage(data.get("stage", "initial"))
-        except ValueError:
-            logger.warning(f"Invalid stage value: {data.get('stage')}. Defaulting to INITIAL.")
-            instance.stage = InterviewStage.INITIAL
+        stage_value = data.get("stage", "initial")
+        stage = _STAGE_BY_VALUE.get(stage_value) if isinstance(stage_value, str) else None
+        if stage is None:
+            logger.warning("Invalid stage value: %s. Defaulting to INITIAL.", data.get('stage'))
+            stage = InterviewStage.INITIAL
+        instance.stage = stage
 
         instance.message_count = data.get("message_count", 0)
         instance.content_message_count = data.get("content_message_count", 0)
@@ -18,50 +18,58 @@ class StageTransitions:
     Manages transitions between interview stages.
     """
 
-    # Define valid transitions between stages
+    # Define valid transitions between stages (frozensets for constant-time membership checks)
     VALID_TRANSITIONS = {
-        InterviewStage.INITIAL: [InterviewStage.ASKING_FOR_IDEA],
+        InterviewStage.INITIAL: frozenset({InterviewStage.ASKING_FOR_IDEA}),
         
-        InterviewStage.ASKING_FOR_IDEA: [
+        InterviewStage.ASKING_FOR_IDEA: frozenset({
             InterviewStage.ASKING_FOR_ATTRIBUTES,
             InterviewStage.COMPLETE
-        ],
+        }),
         
-        InterviewStage.ASKING_FOR_ATTRIBUTES: [
+        InterviewStage.ASKING_FOR_ATTRIBUTES: frozenset({
             InterviewStage.ASKING_FOR_CONSEQUENCES,
             InterviewStage.ASKING_AGAIN_FOR_ATTRIBUTES,
             InterviewStage.ASKING_AGAIN_FOR_ATTRIBUTES_TOO_SHORT,
             InterviewStage.COMPLETE,
             InterviewStage.VALUES_LIMIT_REACHED
-        ],
+        }),
         
-        InterviewStage.ASKING_FOR_CONSEQUENCES: [
+        InterviewStage.ASKING_FOR_CONSEQUENCES: frozenset({
             InterviewStage.ASKING_FOR_CONSEQUENCES_OR_VALUES,
             InterviewStage.ASKING_AGAIN_FOR_ATTRIBUTES,
             InterviewStage.COMPLETE,
             InterviewStage.VALUES_LIMIT_REACHED
-        ],
+        }),
         
-        InterviewStage.ASKING_FOR_CONSEQUENCES_OR_VALUES: [
+        InterviewStage.ASKING_FOR_CONSEQUENCES_OR_VALUES: frozenset({
             InterviewStage.ASKING_FOR_CONSEQUENCES_OR_VALUES,
             InterviewStage.ASKING_AGAIN_FOR_ATTRIBUTES,
             InterviewStage.COMPLETE,
             InterviewStage.VALUES_LIMIT_REACHED
-        ],
+        }),
         
-        InterviewStage.ASKING_AGAIN_FOR_ATTRIBUTES: [
+        InterviewStage.ASKING_AGAIN_FOR_ATTRIBUTES: frozenset({
             InterviewStage.ASKING_FOR_ATTRIBUTES,
             InterviewStage.COMPLETE,
             InterviewStage.VALUES_LIMIT_REACHED,
             InterviewStage.ASKING_AGAIN_FOR_ATTRIBUTES_TOO_SHORT
-        ],
+        }),
 
-        InterviewStage.ASKING_AGAIN_FOR_ATTRIBUTES_TOO_SHORT: [
+        InterviewStage.ASKING_AGAIN_FOR_ATTRIBUTES_TOO_SHORT: frozenset({
             InterviewStage.COMPLETE,
             InterviewStage.VALUES_LIMIT_REACHED,
             InterviewStage.ASKING_FOR_CONSEQUENCES_OR_VALUES,
             InterviewStage.ASKING_AGAIN_FOR_ATTRIBUTES,
-        ],
+        }),
+    }
+
+    # Stage to continue with after a node of the given label
+    _LABEL_TO_STAGE = {
+        NodeLabel.STIMULUS: InterviewStage.ASKING_FOR_IDEA,
+        NodeLabel.IDEA: InterviewStage.ASKING_FOR_ATTRIBUTES,
+        NodeLabel.ATTRIBUTE: InterviewStage.ASKING_FOR_CONSEQUENCES,
+        NodeLabel.CONSEQUENCE: InterviewStage.ASKING_FOR_CONSEQUENCES_OR_VALUES,
     }
 
     @classmethod
@@ -78,25 +86,15 @@ class StageTransitions:
             # Check if values limit is reached if a function is provided
             if has_reached_values_limit_func and has_reached_values_limit_func():
                 state_manager.set_stage(InterviewStage.VALUES_LIMIT_REACHED)
-                logger.info("Interview stage: VALUES_LIMIT_REACHED set.")
+                logger.debug("Interview stage: VALUES_LIMIT_REACHED set.")
             else:
                 state_manager.set_stage(InterviewStage.COMPLETE)
-                logger.info("Interview stage: COMPLETE set.")
+                logger.debug("Interview stage: COMPLETE set.")
         else:
-            label = node_obj.get_label()
-
-            if label == NodeLabel.STIMULUS:
-                state_manager.set_stage(InterviewStage.ASKING_FOR_IDEA)
-                logger.info("Interview stage: ASKING_FOR_IDEA set.")
-            elif label == NodeLabel.IDEA:
-                state_manager.set_stage(InterviewStage.ASKING_FOR_ATTRIBUTES)
-                logger.info("Interview stage: ASKING_FOR_ATTRIBUTES set.")
-            elif label == NodeLabel.ATTRIBUTE:
-                state_manager.set_stage(InterviewStage.ASKING_FOR_CONSEQUENCES)
-                logger.info("Interview stage: ASKING_FOR_CONSEQUENCES set.")
-            elif label == NodeLabel.CONSEQUENCE:
-                state_manager.set_stage(InterviewStage.ASKING_FOR_CONSEQUENCES_OR_VALUES)
-                logger.info("Interview stage: ASKING_FOR_CONSEQUENCES_OR_VALUES set.")
+            stage = cls._LABEL_TO_STAGE.get(node_obj.get_label())
+            if stage is not None:
+                state_manager.set_stage(stage)
+                logger.debug("Interview stage: %s set.", stage.name)
 
     @classmethod
     def get_next_stage(cls, current_stage: InterviewStage, node_label: Optional[NodeLabel] = None, 
@@ -113,30 +111,25 @@ class StageTransitions:
             The next interview stage
         """
         if values_limit_reached:
-            logger.info(f"Values limit reached, transitioning from {current_stage.value} to VALUES_LIMIT_REACHED")
+            logger.info("Values limit reached, transitioning from %s to VALUES_LIMIT_REACHED", current_stage.value)
             return InterviewStage.VALUES_LIMIT_REACHED
             
         if not node_label:
-            logger.info(f"No node label provided, ending interview from {current_stage.value}")
+            logger.info("No node label provided, ending interview from %s", current_stage.value)
             return InterviewStage.COMPLETE
             
         # Default transitions based on node label
-        if node_label == NodeLabel.STIMULUS:
-            return InterviewStage.ASKING_FOR_IDEA
-        elif node_label == NodeLabel.IDEA:
-            return InterviewStage.ASKING_FOR_ATTRIBUTES
-        elif node_label == NodeLabel.ATTRIBUTE:
-            return InterviewStage.ASKING_FOR_CONSEQUENCES
-        elif node_label == NodeLabel.CONSEQUENCE:
-            return InterviewStage.ASKING_FOR_CONSEQUENCES_OR_VALUES
+        next_stage = cls._LABEL_TO_STAGE.get(node_label)
+        if next_stage is not None:
+            return next_stage
         
         # If no specific rule applies, stay in the current stage if possible
         # or transition to COMPLETE as a safe default
         if current_stage in cls.VALID_TRANSITIONS:
-            logger.info(f"No specific transition rule for {node_label} from {current_stage.value}, staying in current stage")
+            logger.info("No specific transition rule for %s from %s, staying in current stage", node_label, current_stage.value)
             return current_stage
         else:
-            logger.warning(f"No valid transition from {current_stage.value} with {node_label}, defaulting to COMPLETE")
+            logger.warning("No valid transition from %s with %s, defaulting to COMPLETE", current_stage.value, node_label)
             return InterviewStage.COMPLETE
 
     @classmethod
@@ -152,11 +145,11 @@ class StageTransitions:
             True if the transition is valid
         """
         if from_stage not in cls.VALID_TRANSITIONS:
-            logger.warning(f"No defined transitions from {from_stage.value}")
+            logger.warning("No defined transitions from %s", from_stage.value)
             return False
             
         if to_stage in cls.VALID_TRANSITIONS[from_stage]:
             return True
         
-        logger.warning(f"Invalid transition from {from_stage.value} to {to_stage.value}")
+        logger.warning("Invalid transition from %s to %s", from_stage.value, to_stage.value)
         return False
\ No newline at end of file
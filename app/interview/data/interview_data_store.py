@@ -4,11 +4,13 @@ Manages database operations for interviews.
 """
 
 import logging
+import uuid
 from typing import Optional
 
-from app.db.session import get_db
+from app.db.session import async_session
 from app.db.models_chat import ChatSession, ChatInteraction
-from sqlalchemy import select
+from sqlalchemy import insert, select, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 logger = logging.getLogger(__name__)
 
@@ -31,36 +33,43 @@ class InterviewDataStore:
             ID of the chat session or None if creation failed
         """
         try:
-            async for session in get_db():
-                # Check if a ChatSession already exists for this interview session
-                stmt = select(ChatSession).where(
+            async with async_session() as session:
+                # Insert the ChatSession unless one exists, and return whichever id is present.
+                # Both run in one statement; DO NOTHING avoids rewriting the existing row on every message.
+                inserted = (
+                    pg_insert(ChatSession)
+                    .values(interview_session_id=interview_session_id)
+                    .on_conflict_do_nothing(index_elements=[ChatSession.interview_session_id])
+                    .returning(ChatSession.id)
+                    .cte("inserted")
+                )
+                existing = select(ChatSession.id).where(
                     ChatSession.interview_session_id == interview_session_id
                 )
-                result = await session.execute(stmt)
-                chat_session = result.scalars().first()
+                result = await session.execute(
+                    union_all(select(inserted.c.id), existing).limit(1)
+                )
+                chat_session_id = result.scalar_one_or_none()
 
-                if not chat_session:
-                    # Create a new ChatSession
-                    chat_session = ChatSession(
-                        interview_session_id=interview_session_id
-                    )
-                    session.add(chat_session)
-                    await session.commit()
-                    await session.refresh(chat_session)
-                    logger.info(
-                        f"New chat session {chat_session.id} created for interview session {interview_session_id}")
+                if chat_session_id is None:
+                    # A concurrent request committed the row after this statement's snapshot was taken
+                    chat_session_id = (await session.execute(existing)).scalar_one()
 
-                return chat_session.id
+                await session.commit()
+                return chat_session_id
 
         except Exception as e:
             logger.error(f"Error creating/retrieving chat session: {e}")
             return None
 
     @staticmethod
-    async def store_interaction(chat_session_id: str, system_question: str, user_answer: str) -> Optional[int]:
+    async def store_interaction(chat_session_id: str, system_question: str, user_answer: str) -> Optional[str]:
         """
         Store a chat interaction in the database.
 
+        The insert is awaited because the returned ID is linked into node traces,
+        so it must only be handed out once the row exists.
+
         Args:
             chat_session_id: ID of the chat session
             system_question: The question from the system
@@ -69,23 +78,22 @@ class InterviewDataStore:
         Returns:
             ID of the created interaction or None if creation failed
         """
+        # Generated client-side, so no refresh round-trip is needed to read it back
+        interaction_id = str(uuid.uuid4())
         try:
-            # Create a new ChatInteraction object with the chat session ID
-            new_interaction = ChatInteraction(
-                session_id=chat_session_id,
-                system_question=system_question,
-                user_answer=user_answer
-            )
-
-            async for session in get_db():
-                # Add the interaction to the database
-                session.add(new_interaction)
+            async with async_session() as session:
+                await session.execute(
+                    insert(ChatInteraction).values(
+                        id=interaction_id,
+                        session_id=chat_session_id,
+                        system_question=system_question,
+                        user_answer=user_answer,
+                    )
+                )
                 await session.commit()
-                await session.refresh(new_interaction)
-                logger.info(
-                    f"Chat interaction {new_interaction.id} successfully stored")
-                return new_interaction.id
+            logger.info("Chat interaction %s successfully stored", interaction_id)
+            return interaction_id
 
         except Exception as e:
-            logger.error(f"Error storing chat interaction: {e}")
+            logger.error("Error storing chat interaction: %s", e)
             return None
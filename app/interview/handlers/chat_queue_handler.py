@@ -3,14 +3,30 @@ Queue Manager for the Interview Engine.
 Manages a hierarchical queue with priority rules.
 """
 
+import heapq
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set, Tuple
 
 from app.interview.interview_tree.node import Node
 from app.interview.interview_tree.node_label import NodeLabel
 
 logger = logging.getLogger(__name__)
 
+# Enum members are singletons: module aliases plus `is` skip the attribute lookup and __eq__
+_IDEA = NodeLabel.IDEA
+_VALUE = NodeLabel.VALUE
+_IRRELEVANT = NodeLabel.IRRELEVANT_ANSWER
+_STIMULUS = NodeLabel.STIMULUS
+_ATTRIBUTE = NodeLabel.ATTRIBUTE
+_CONSEQUENCE = NodeLabel.CONSEQUENCE
+
+# Processing order of queued nodes, lower comes first
+_LABEL_PRIORITY = {
+    _CONSEQUENCE: 0,
+    _ATTRIBUTE: 1,
+}
+_DEFAULT_PRIORITY = 2
+
 
 class QueueManager:
     """
@@ -34,8 +50,16 @@ class QueueManager:
 
     def init_new(self):
         """Initialize a new empty queue."""
-        # Single queue for all node types in priority order
-        self.queue: List[Node] = []
+        # Single min-heap for all node types, entries are (priority, order, node)
+        self.queue: List[Tuple[int, int, Node]] = []
+        # IDs of the nodes in the heap for O(1) duplicate checks
+        self._queue_ids: Set[str] = set()
+        # Insertion counter, keeps the order within a priority stable and unique,
+        # so heap entries never fall back to comparing nodes
+        self._seq = 0
+        # Pending stimuli, processed after the heap in insertion order (dict keeps it);
+        # doubles as their duplicate check
+        self._stimuli: Dict[str, Node] = {}
         self.active_node: Optional[Node] = None
         self.active_node_unchanged_count = 0
 
@@ -50,17 +74,16 @@ class QueueManager:
         Args:
             stimulus_nodes: List of stimulus nodes to add to the queue
         """
-        self.queue.clear()
-        self.queue.extend(stimulus_nodes)
+        self._restore_queue(stimulus_nodes)
 
-        logger.info(f"Queue initialized with {len(self.queue)} stimuli")
+        logger.info("Queue initialized with %d stimuli", len(self._stimuli))
 
-        first_stimulus = self.queue.pop(0)
+        first_stimulus = self._pop_stimulus()
         self.tree.set_active_node(first_stimulus)
         self.active_node = first_stimulus
 
         logger.info(
-            f"First stimulus set as active node: {first_stimulus.get_label().value}"
+            "First stimulus set as active node: %s", first_stimulus.get_label().value
         )
 
     def _set_active_node(self, node_obj: Node) -> None:
@@ -70,8 +93,17 @@ class QueueManager:
         Args:
             node_obj: The node to set as active
         """
-        self.active_node = node_obj
         self.active_node_unchanged_count = 0
+        self._set_active_node_preserve_count(node_obj)
+
+    def _set_active_node_preserve_count(self, node_obj: Node) -> None:
+        """
+        Set the active node without resetting the unchanged counter.
+
+        Args:
+            node_obj: The node to set as active
+        """
+        self.active_node = node_obj
         if self.tree is not None:
             self.tree.set_active_node(node_obj)
 
@@ -80,7 +112,7 @@ class QueueManager:
         Add a node to the queue based on its label and priority rules.
         - IDEAS are directly set as active (not in queue)
         - VALUES are never added to queue
-        - All other types are sorted by hierarchy
+        - All other types are ordered by priority (see _push)
         - Prevents duplicate entries of the same node in the queue by merging with unprocessed nodes
 
         Args:
@@ -91,110 +123,117 @@ class QueueManager:
 
         label = node_obj.get_label()
 
-        if label == NodeLabel.IDEA:
-            logger.info(
-                f"IDEA '{node_obj.get_conclusion()}' directly set as active"
-            )
+        if label is _IDEA:
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("IDEA '%s' directly set as active", node_obj.get_conclusion())
             # Remove irrelevant answer nodes if present
-            if self.active_node and self.active_node.get_label() == NodeLabel.IRRELEVANT_ANSWER:
+            if self.active_node and self.active_node.get_label() is _IRRELEVANT:
                 self.tree.remove_irrelevant_node()
             self._set_active_node(node_obj)
             return
 
-        elif label == NodeLabel.VALUE:
-            logger.info(
-                f"VALUE '{node_obj.get_conclusion()}' detected (not added to queue)"
-            )
+        elif label is _VALUE:
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "VALUE '%s' detected (not added to queue)", node_obj.get_conclusion()
+                )
             # Remove irrelevant answer nodes if present
-            if self.active_node and self.active_node.get_label() == NodeLabel.IRRELEVANT_ANSWER:
+            if self.active_node and self.active_node.get_label() is _IRRELEVANT:
                 self.tree.remove_irrelevant_node()
                 # Synchronize active_node with tree.active
                 self.active_node = self.tree.active
             return
 
-        elif label == NodeLabel.IRRELEVANT_ANSWER:
-            logger.info(
-                f"IRRELEVANT_ANSWER '{node_obj.get_conclusion()}' detected - will be stacked"
-            )
+        elif label is _IRRELEVANT:
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "IRRELEVANT_ANSWER '%s' detected - will be stacked",
+                    node_obj.get_conclusion(),
+                )
 
             # If this is stacking onto an existing irrelevant node (same ID),
             # don't reset the counter
-            if self.active_node and self.active_node.get_label() == NodeLabel.IRRELEVANT_ANSWER:
+            if self.active_node and self.active_node.get_label() is _IRRELEVANT:
                 # Just update the active node without resetting the counter
-                self.active_node = node_obj
-                if self.tree is not None:
-                    self.tree.set_active_node(node_obj)
+                self._set_active_node_preserve_count(node_obj)
             else:
                 # This is a new irrelevant node, not stacking
                 self._set_active_node(node_obj)
             return
 
         # Check if the node is already in the queue - due to merging unprocessed nodes
-        for existing_node in self.queue:
-            if existing_node.id == node_obj.id:
-                logger.warning(
-                    f"{label.value} with ID {node_obj.id} already in queue - not added again"
-                )
-                return
-
-        # Determine insertion position and insert node
-        insert_pos = self._get_insert_position(label)
+        if node_obj.id in self._queue_ids or node_obj.id in self._stimuli:
+            logger.warning(
+                "%s with ID %s already in queue - not added again", label.value, node_obj.id
+            )
+            return
 
-        self.queue.insert(insert_pos, node_obj)
-        logger.info(
-            f"{label.value} inserted at position {insert_pos} (Queue: {len(self.queue)} nodes)"
-        )
+        if label is _STIMULUS:
+            self._stimuli[node_obj.id] = node_obj
+        else:
+            self._push(node_obj, label)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "%s added to queue (Queue: %d nodes)",
+                label.value,
+                len(self.queue) + len(self._stimuli),
+            )
 
-    def _get_insert_position(self, label: NodeLabel) -> int:
+    def _push(self, node_obj: Node, label: NodeLabel) -> None:
         """
-        Determine insertion position for Attribute and Consequence nodes.
+        Push a node onto the priority queue.
 
-        Rules for Consequences:
-        - Always insert at the front (since many detected Consequences were already inverted)
-
-        Rules for Attributes:
-        - Always insert after the last Attribute in the queue
-        - If no Attribute in the queue, insert after the last Consequence
+        Rules:
+        - Consequences come first, newest first (many detected Consequences were already inverted)
+        - Attributes follow in the order they were added
+        - All other nodes follow in the order they were added
+        - Stimuli are kept outside the heap and come last (see _pop_stimulus)
 
         Args:
-            label: Label of the node to insert
+            node_obj: Node to push
+            label: Label of the node
+        """
+        self._seq += 1
+        rank = _LABEL_PRIORITY.get(label, _DEFAULT_PRIORITY)
+        order = -self._seq if label is _CONSEQUENCE else self._seq
+        heapq.heappush(self.queue, (rank, order, node_obj))
+        self._queue_ids.add(node_obj.id)
+
+    def _pop(self) -> Node:
+        """Remove and return the node with the highest priority."""
+        node_obj = heapq.heappop(self.queue)[2]
+        self._queue_ids.discard(node_obj.id)
+        return node_obj
+
+    def _pop_stimulus(self) -> Node:
+        """Remove and return the oldest pending stimulus."""
+        stimulus_id = next(iter(self._stimuli))
+        return self._stimuli.pop(stimulus_id)
+
+    def _restore_queue(self, nodes: List[Node]) -> None:
+        """
+        Rebuild the priority queue and the pending stimuli from nodes in processing order.
 
-        Returns:
-            Position in the queue where the node should be inserted
+        Args:
+            nodes: Queued nodes, first to be processed first
         """
-        # Only for Attributes and Consequences
-        if label != NodeLabel.ATTRIBUTE and label != NodeLabel.CONSEQUENCE:
-            return len(self.queue)
-
-        # Empty queue? Insert at beginning
-        if not self.queue:
-            return 0
-
-        # Find the position of the last node of each type
-        last_c_pos = -1
-        last_a_pos = -1
-
-        for i, node in enumerate(self.queue):
-            if node.get_label() == NodeLabel.CONSEQUENCE:
-                last_c_pos = i
-            elif node.get_label() == NodeLabel.ATTRIBUTE:
-                last_a_pos = i
-
-        # Decide based on label where to insert
-        if label == NodeLabel.CONSEQUENCE:
-            # Always insert new consequences at the beginning of the queue
-            # This ensures they are processed before attributes
-            return 0
-        else:  # label == NodeLabel.ATTRIBUTE
-            # Insert after the last Attribute
-            if last_a_pos >= 0:
-                return last_a_pos + 1
-            # If no Attributes, insert after the last Consequence
-            elif last_c_pos >= 0:
-                return last_c_pos + 1
-            # If neither Attributes nor Consequences, insert at end
+        self.queue = []
+        self._stimuli = {}
+        for i, n in enumerate(nodes):
+            label = n.get_label()
+            if label is _STIMULUS:
+                self._stimuli[n.id] = n
             else:
-                return len(self.queue)
+                self.queue.append((_LABEL_PRIORITY.get(label, _DEFAULT_PRIORITY), i, n))
+        heapq.heapify(self.queue)
+        self._queue_ids = {entry[2].id for entry in self.queue}
+        self._seq = len(nodes)
+
+    def _ordered_nodes(self) -> List[Node]:
+        """Return the queued nodes in processing order."""
+        ordered = [entry[2] for entry in sorted(self.queue)]
+        ordered.extend(self._stimuli.values())
+        return ordered
 
     def update_unchanged_count(self, has_required_element: bool) -> None:
         """
@@ -208,7 +247,9 @@ class QueueManager:
         else:
             self.active_node_unchanged_count += 1
             logger.warning(
-                f"Active node unchanged: {self.active_node_unchanged_count}/{self.MAX_UNCHANGED_COUNT}"
+                "Active node unchanged: %d/%d",
+                self.active_node_unchanged_count,
+                self.MAX_UNCHANGED_COUNT,
             )
 
     def should_move_to_next_node(self) -> bool:
@@ -228,12 +269,12 @@ class QueueManager:
         Returns:
             The next node from the queue or None if empty
         """
-        if not self.queue:
+        if not self.queue and not self._stimuli:
             logger.warning("Queue is empty, no next active node available")
             return None
 
         # Synchronize active_node with tree.active if there are discrepancies
-        if self.tree and self.active_node != self.tree.active:
+        if self.tree is not None and self.active_node is not self.tree.active:
             logger.warning(
                 "Synchronizing active_node: QueueManager (%s) vs. Tree (%s)",
                 self.active_node.id if self.active_node else "None",
@@ -244,16 +285,17 @@ class QueueManager:
         # If active node is an irrelevant answer node, remove it
         if (
             self.active_node
-            and self.active_node.get_label() == NodeLabel.IRRELEVANT_ANSWER
+            and self.active_node.get_label() is _IRRELEVANT
             and self.active_node_unchanged_count < self.MAX_UNCHANGED_COUNT
         ):
             self.tree.remove_irrelevant_node()
             # Synchronize active_node with tree.active
             self.active_node = self.tree.active
 
-        next_node = self.queue.pop(0)
+        next_node = self._pop() if self.queue else self._pop_stimulus()
         self._set_active_node(next_node)
-        logger.info(f"Next active node: {next_node.get_label().value}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Next active node: %s", next_node.get_label().value)
         return next_node
 
     def get_active_node_unchanged_count(self) -> int:
@@ -272,9 +314,10 @@ class QueueManager:
         Returns:
             Dictionary representation of the queue state
         """
+        # Nodes are stored by ID only, from_dict resolves them against the tree
         return {
-            "queue": [n.to_dict() for n in self.queue],
-            "active_node": self.active_node.to_dict() if self.active_node else None,
+            "queue": [{"id": n.id} for n in self._ordered_nodes()],
+            "active_node": {"id": self.active_node.id} if self.active_node else None,
             "active_node_unchanged_count": self.active_node_unchanged_count,
         }
 
@@ -294,25 +337,27 @@ class QueueManager:
         instance.tree = tree_instance
 
         # Restore queue based on IDs (don't parse again!)
-        # (now UUID string)
-        instance.queue = []
+        # (now UUID string), resolved through one ID map instead of a tree scan per node
+        id_map = tree_instance.get_id_map()
+        queued_nodes = []
         for node_data in data.get("queue", []):
             node_id = node_data["id"] 
-            node_in_tree = tree_instance.get_node_by_id(node_id)
+            node_in_tree = id_map.get(node_id)
             if node_in_tree:
-                instance.queue.append(node_in_tree)
+                queued_nodes.append(node_in_tree)
             else:
-                logger.error(f"COULD NOT FIND NODE: {node_id} INSIDE TREE")
+                logger.error("COULD NOT FIND NODE: %s INSIDE TREE", node_id)
+        instance._restore_queue(queued_nodes)
 
         # Set active node (also by ID)
         active_node_data = data.get("active_node")
         if active_node_data:
             node_id = active_node_data["id"]
-            node_in_tree = tree_instance.get_node_by_id(node_id)
+            node_in_tree = id_map.get(node_id)
             if node_in_tree:
                 instance._set_active_node(node_in_tree)
             else:
-                logger.error(f"UNABLE TO RECONSTRUCT NODE: {node_id} FROM TREE")
+                logger.error("UNABLE TO RECONSTRUCT NODE: %s FROM TREE", node_id)
 
         instance.active_node_unchanged_count = data.get("active_node_unchanged_count", 0)
         return instance
@@ -227,11 +227,9 @@ class MessageProcessingManager:
             Tuple of (filtered_elements, filtered_relationships)
         """
         # Check if complete ACV chains were detected
-        has_attributes = any(element[0] == NodeLabel.ATTRIBUTE for element in elements)
-        has_consequences = any(element[0] == NodeLabel.CONSEQUENCE for element in elements)
-        has_values = any(element[0] == NodeLabel.VALUE for element in elements)
+        detected_labels = {element[0] for element in elements}
         
-        if has_attributes and has_consequences and has_values:
+        if {NodeLabel.ATTRIBUTE, NodeLabel.CONSEQUENCE, NodeLabel.VALUE} <= detected_labels:
             logger.info("A, C and V elements detected - checking for complete ACV chains...")
             return self.relationship_processor.filter_acv_chains(elements, causal_relationships)
             
@@ -342,7 +340,7 @@ class MessageProcessingManager:
         
         Args:
             relationship_map: Map of source keys to lists of target keys
-            elements_map: Map of element keys to elements
+            elements_map: Map of label -> summary -> element
             processed_nodes: Map to collect processed nodes
             all_processed_nodes: List to collect all processed nodes
             end_nodes_keys: Set of keys for end nodes
@@ -384,7 +382,7 @@ class MessageProcessingManager:
         Args:
             source_key, source_label, source_summary: Source element info
             target_keys: List of target keys
-            elements_map: Map of element keys to elements
+            elements_map: Map of label -> summary -> element
             processed_nodes: Map of processed nodes
             all_processed_nodes, end_nodes_keys, final_nodes: Collection tracking
             client, model, topic, stimulus, interaction_id: Standard parameters
@@ -468,7 +466,7 @@ class MessageProcessingManager:
         Args:
             source_node: The parent node
             target_keys: List of target keys
-            elements_map: Map of element keys to elements
+            elements_map: Map of label -> summary -> element
             processed_nodes: Map of processed nodes
             all_processed_nodes, end_nodes_keys, final_nodes: Collection tracking
             client, model, topic, stimulus, interaction_id: Standard parameters
@@ -477,7 +475,7 @@ class MessageProcessingManager:
             target_label, target_summary = target_key
             
             # Check if target element is new
-            target_elem = elements_map.get(target_key)
+            target_elem = elements_map.get(target_label, {}).get(target_summary)
             if not target_elem or not target_elem[2]:  # target_elem[2] is is_new_element
                 logger.info(
                     f"Skipping target element: {target_label.value} - '{target_summary}' - not new or not found")
@@ -3,7 +3,7 @@ Node class representing a single node in the ACV interview tree.
 This is a core data structure class that models hierarchical relationships.
 """
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from .node_label import NodeLabel
 from ..models.trace_explanation_element import TraceExplanationElement
 import logging
@@ -20,6 +20,10 @@ class Node:
     Uses UUIDs for IDs and a monotonic timestamp to determine recency.
     """
 
+    # Process-wide counter, bumped whenever a node is created or modified. Handlers mutate nodes
+    # directly and nodes do not know their tree, so it serves as the version of every tree.
+    _mutation_version = 0
+
     def __repr__(self):
         return f"<Node label={self.label} content={self.conclusion} parent={self.parents}>"
 
@@ -64,6 +68,12 @@ class Node:
         self.children: List['Node'] = []
         self.trace = trace if trace else []
         self.backwards_relations: List['Node'] = []
+        Node._mutation_version += 1
+
+    @staticmethod
+    def get_mutation_version() -> int:
+        """Get the counter that changes whenever any node is created or modified."""
+        return Node._mutation_version
 
     def get_parents(self) -> List['Node']:
         """Get all parent nodes of this node."""
@@ -81,6 +91,10 @@ class Node:
         """Get the conclusion text of this node."""
         return self.conclusion
 
+    def get_label_and_conclusion(self) -> Tuple[NodeLabel, Optional[str]]:
+        """Get the label and the conclusion of this node in one call."""
+        return self.label, self.conclusion
+
     def get_value_path_completed(self) -> bool:
         """Check if this node is part of a completed value path."""
         return self.is_value_path_completed
@@ -94,6 +108,7 @@ class Node:
             conclusion: New conclusion text
         """
         self.conclusion = conclusion
+        Node._mutation_version += 1
 
     def set_value_path_completed(self, completed: bool):
         """
@@ -103,6 +118,7 @@ class Node:
             completed: Value path completion status
         """
         self.is_value_path_completed = completed
+        Node._mutation_version += 1
 
     def add_child(self, child: 'Node'):
         """
@@ -115,6 +131,7 @@ class Node:
             self.children.append(child)
         if self not in child.parents:
             child.parents.append(self)
+        Node._mutation_version += 1
 
     def add_parent(self, parent: 'Node'):
         """
@@ -127,6 +144,7 @@ class Node:
             self.parents.append(parent)
         if self not in parent.children:
             parent.children.append(self)
+        Node._mutation_version += 1
 
     def remove_child(self, child_node: 'Node'):
         """
@@ -137,6 +155,7 @@ class Node:
         """
         if child_node in self.children:
             self.children.remove(child_node)
+            Node._mutation_version += 1
             logger.debug(
                 f"Removed node {child_node.id} from children of node {self.id}")
 
@@ -173,6 +192,7 @@ class Node:
         """
         if related_node not in self.backwards_relations:
             self.backwards_relations.append(related_node)
+            Node._mutation_version += 1
 
     def get_backwards_relations(self) -> List['Node']:
         """
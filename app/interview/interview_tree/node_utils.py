@@ -3,6 +3,7 @@ Node utilities module for common node operations.
 Provides functions for managing and querying nodes in the interview tree.
 """
 
+from functools import lru_cache
 from typing import Tuple
 from app.interview.interview_tree.node_label import NodeLabel
 
@@ -36,9 +37,11 @@ class NodeUtils:
         return label, summary, True
     
     @classmethod
+    @lru_cache(maxsize=4096)
     def is_auto_generated(cls, summary: str) -> bool:
         """
         Checks if a summary belongs to an automatically generated node.
+        Results are cached per summary, the same path nodes are checked on every context build.
         
         Args:
             summary: Summary to check
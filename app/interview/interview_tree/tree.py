@@ -36,6 +36,14 @@ class Tree:
         if self.root and self.root.get_label() in self.nodes_by_label:
             self.nodes_by_label[self.root.get_label()].append(self.root)
 
+    @property
+    def version(self) -> int:
+        """
+        Version of the tree contents, changes whenever a node is created or modified.
+        Used to memoize results derived from the tree.
+        """
+        return Node.get_mutation_version()
+
     def get_tree_root(self) -> Node:
         """Get the root node of the tree."""
         return self.root
@@ -58,6 +66,20 @@ class Tree:
                     return n
         return None
 
+    def get_id_map(self) -> Dict[str, Node]:
+        """
+        Build a mapping from node ID to node for repeated lookups.
+        Like get_node_by_id, the first registered node wins for duplicate IDs.
+
+        Returns:
+            Dictionary mapping node IDs (UUID strings) to nodes
+        """
+        id_map: Dict[str, Node] = {}
+        for nodes in self.nodes_by_label.values():
+            for n in nodes:
+                id_map.setdefault(n.id, n)
+        return id_map
+
     def get_nodes_by_label(self, label: NodeLabel) -> List[Node]:
         """
         Get all nodes with the given label that have a conclusion.
@@ -73,6 +95,21 @@ class Tree:
             if node.get_conclusion() is not None
         ]
 
+    def count_nodes_by_label(self, label: NodeLabel) -> int:
+        """
+        Count the nodes with the given label that have a conclusion, without building a list.
+
+        Args:
+            label: Node label to count
+
+        Returns:
+            Number of nodes with the given label and non-empty conclusion
+        """
+        return sum(
+            1 for node in self.nodes_by_label.get(label, ())
+            if node.get_conclusion() is not None
+        )
+
     def get_nodes_path_to_root(self, node_obj: Node) -> List[Node]:
         """
         Get the path from the given node to the root.
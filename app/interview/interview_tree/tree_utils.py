@@ -339,6 +339,38 @@ class TreeUtils:
 
         return merged_tree
 
+    @staticmethod
+    def resolve_effective_active(tree: Optional[Tree]) -> Tuple[Optional[Node], Optional[NodeLabel], str]:
+        """
+        Determines the node to use as active node for prompting.
+        An IRRELEVANT active node is replaced by its latest parent, or by the root if it has none.
+
+        Args:
+            tree: Interview tree
+
+        Returns:
+            Tuple of (effective active node, its label, label string or "UNKNOWN")
+        """
+        if not tree or not tree.active:
+            return None, None, "UNKNOWN"
+
+        node = tree.active
+        if node.get_label() == NodeLabel.IRRELEVANT_ANSWER:
+            logger.debug("Active node is IRRELEVANT (ID: %s) - using parent", node.id)
+            parent = node.get_latest_parent()
+            if parent:
+                node = parent
+                logger.debug("Using parent node: %s", node.id)
+            elif tree.get_tree_root():
+                node = tree.get_tree_root()
+                logger.debug("No parent found, using root: %s", node.id)
+            else:
+                logger.debug("No parent or root found")
+                return None, None, "UNKNOWN"
+
+        label = node.get_label()
+        return node, label, label.value if label else "UNKNOWN"
+
     @staticmethod
     def build_optimized_path_excluding_irrelevant(interview_tree: Tree, active_node: Node) -> List[Node]:
         """
@@ -362,27 +394,46 @@ class TreeUtils:
         # Follow path of newest parents (latest created_ns)
         # but skip irrelevant nodes
         while current:
-            parent = current.get_latest_parent()
+            parent = TreeUtils.next_optimized_path_node(current)
             if not parent:
                 break
 
-            # Skip irrelevant nodes in path
-            if parent.get_label() == NodeLabel.IRRELEVANT_ANSWER:
-                logger.debug(f"Skipping irrelevant node in path: {parent.id}")
-                # Try to find parent of irrelevant node
-                grandparents = parent.get_parents()
-                if grandparents:
-                    parent = grandparents[0]  # Use first grandparent node
-                    logger.debug(
-                        f"Using grandparent node: {parent.id} - {parent.get_label().value}")
-                else:
-                    break  # No more parents available
-
             path_nodes.append(parent)
             current = parent
 
         return path_nodes
 
+    @staticmethod
+    def next_optimized_path_node(node: Node) -> Optional[Node]:
+        """
+        Returns the node following the given one on the optimized path to the root:
+        its newest parent, or the first parent of that parent if the newest parent is irrelevant.
+
+        The path only depends on the current node, so callers can memoize path suffixes by node.
+
+        Args:
+            node: Current node on the path
+
+        Returns:
+            Next node towards the root, or None if the path ends here
+        """
+        parent = node.get_latest_parent()
+        if not parent:
+            return None
+
+        # Skip irrelevant nodes in path
+        if parent.get_label() == NodeLabel.IRRELEVANT_ANSWER:
+            logger.debug(f"Skipping irrelevant node in path: {parent.id}")
+            # Try to find parent of irrelevant node
+            grandparents = parent.get_parents()
+            if not grandparents:
+                return None  # No more parents available
+            parent = grandparents[0]  # Use first grandparent node
+            logger.debug(
+                f"Using grandparent node: {parent.id} - {parent.get_label().value}")
+
+        return parent
+
     @staticmethod
     def build_context_path_from_node(tree: 'Tree', node: Optional[Node]) -> str:
         """
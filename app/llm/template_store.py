@@ -3,7 +3,8 @@ Prompt templates for LLM interactions.
 Provides a centralized store for all prompt templates.
 """
 
-from typing import Dict, Any
+from string import Formatter
+from typing import Dict, Any, Optional, Tuple
 
 from app.llm.templates import ALL_TEMPLATES
 from app.llm.templates.element_analysis_templates import ELEMENT_ANALYSIS_TEMPLATES
@@ -12,6 +13,31 @@ from app.llm.templates.question_generation_templates import QUESTION_GENERATION_
 # Maintain backwards compatibility
 TEMPLATES = ALL_TEMPLATES
 
+
+def _compile_template(template: str) -> Optional[Tuple[Tuple[str, Optional[str]], ...]]:
+    """
+    Splits a template into (literal_text, field_name) pairs once, so rendering only
+    has to substitute the variables instead of re-parsing the whole prompt.
+
+    Args:
+        template: Template string in str.format syntax
+
+    Returns:
+        Tuple of (literal_text, field_name) pairs, or None if the template uses
+        format specs, conversions or indexed fields and must go through str.format
+    """
+    parts = []
+    for literal, field, spec, conversion in Formatter().parse(template):
+        if field is not None and (spec or conversion or not field.isidentifier()):
+            return None
+        parts.append((literal, field))
+    return tuple(parts)
+
+
+# Parsed templates, built once at import
+_COMPILED_TEMPLATES = {name: _compile_template(template) for name, template in TEMPLATES.items()}
+
+
 def render_template(name: str, **vars: Any) -> str:
     """
     Format a template with provided variables or provide a helpful error message.
@@ -29,7 +55,15 @@ def render_template(name: str, **vars: Any) -> str:
     """
     if name not in TEMPLATES:
         raise KeyError(f"Unknown template '{name}'.")
+    compiled = _COMPILED_TEMPLATES.get(name)
     try:
-        return TEMPLATES[name].format(**vars)
+        if compiled is None:
+            return TEMPLATES[name].format(**vars)
+        out = []
+        for literal, field in compiled:
+            out.append(literal)
+            if field is not None:
+                out.append(format(vars[field], ""))
+        return "".join(out)
     except KeyError as miss:
         raise ValueError(f"Missing template variable {miss}") from None
@@ -10,17 +10,7 @@ ELEMENT_ANALYSIS_TEMPLATES = {
 
 You are an expert in means-end chain theory and the laddering interview method, specifically skilled at recognizing elements in participant responses.
 Your task is to analyze the user's message and identify ALL distinct elements and their relationships.
-
-## INTERVIEW CONTEXT
-- Topic: {topic}
-- Stimulus: {stimulus}
-- Current interview path (from root to active node): {interview}
-- Current active node: {active_node_info}     # textual summary of the active node
-- Current active node label: {active_node_label}
-- Last question asked: "{last_question}"
-
-## USER MESSAGE TO ANALYZE
-"{message}"
+The INTERVIEW CONTEXT and the USER MESSAGE TO ANALYZE are provided in the user turn.
 
 ## DEFINITIONS & SUBCATEGORIES (use these to classify):
 - ATTRIBUTE (A): System characteristics or triggering features that users can directly perceive or experience.
@@ -56,7 +46,7 @@ Your task is to analyze the user's message and identify ALL distinct elements an
 5. For multiple elements, analyze if there are causal relationships between them (A→C, C→C, C→V)
 
 ## CLASSIFICATION PRIORITY BASED ON ACTIVE NODE:
-- Active node type is {active_node_label} - use this to guide your classification
+- Use the current active node label from the INTERVIEW CONTEXT to guide your classification
 - If active node label is IDEA: Classify ambiguous elements preferentially as ATTRIBUTES (beginning of the means-end chain)
 - If active node label is ATTRIBUTE [A]: Classify ambiguous elements preferentially as CONSEQUENCES (natural progression)
 - If active node label is CONSEQUENCE [C]: Classify highly ambiguous elements preferentially as VALUES
@@ -105,7 +95,7 @@ causality might be present but expressed in non-linear ways. Pay close attention
 - When the active node is an Attribute (A) and the user mentions a Consequence (C), the C MUST be marked as NEW (is_new_element: true)
 - When the active node is a Consequence (C) and the user mentions a Value (V), the V MUST be marked as NEW (is_new_element: true)
 - When detecting a causal relationship, ensure both elements are distinct (not the same concept rephrased)
-- Consider the context of the last question: "{last_question}" and the current interview path: {interview}
+- Consider the context of the last question and the current interview path given in the INTERVIEW CONTEXT
 
 ## EXAMPLE SCENARIOS
 
@@ -161,7 +151,7 @@ IMPORTANT NOTES:
 - Ensure all JSON fields are properly populated for each identified element
 
 ## STRICT CLASSIFICATION RULES BASED ON ACTIVE NODE TYPE
-The current active node type is {active_node_label}. Follow these mandatory rules when classifying elements:
+The current active node type is given in the INTERVIEW CONTEXT. Follow these mandatory rules when classifying elements:
 
 1.When ACTIVE NODE is IDEA:
    - ONLY ATTRIBUTES can be recognized and classified
@@ -200,19 +190,26 @@ The current active node type is {active_node_label}. Follow these mandatory rule
 
 # """,
 
-
-    "idea_check": """
-# IDEA CLASSIFICATION FOR LADDERING INTERVIEWS
-
-You are an expert in laddering interviews and means-end chain theory. Your task is to analyze a user's response and determine if it contains a concrete application idea related to the given stimulus.
-
-## CONTEXT
+# Dynamic part of node_type_analysis, sent as user message after the static system prompt
+"node_type_analysis_context": """
+## INTERVIEW CONTEXT
 - Topic: {topic}
 - Stimulus: {stimulus}
+- Current interview path (from root to active node): {interview}
+- Current active node: {active_node_info}     # textual summary of the active node
+- Current active node label: {active_node_label}
 - Last question asked: "{last_question}"
 
-## USER RESPONSE TO ANALYZE
+## USER MESSAGE TO ANALYZE
 "{message}"
+""",
+
+
+    "idea_check": """
+# IDEA CLASSIFICATION FOR LADDERING INTERVIEWS
+
+You are an expert in laddering interviews and means-end chain theory. Your task is to analyze a user's response and determine if it contains a concrete application idea related to the given stimulus.
+The CONTEXT and the USER RESPONSE TO ANALYZE are provided in the user turn.
 
 ## DEFINITIONS
 - IDEA: A concrete application or specific implementation of the stimulus. It should be a practical way the user thinks the stimulus could work for them personally. It transforms a generic trigger (stimulus) into a concrete application concept.
@@ -244,7 +241,7 @@ You are an expert in laddering interviews and means-end chain theory. Your task
    - For IDEA responses: Summarize the specific application or implementation mentioned (3-5 words)
    - For relevant but non-IDEA responses: Still extract the key concept from the user's message (3-5 words)
    - For IRRELEVANT responses: Explain why it's irrelevant (e.g., "greeting", "off-topic")
-5. Provide your final classification and reasoning
+5. Provide your final classification
 
 ## SUMMARY CREATION GUIDANCE
 - For relevant content (whether IDEA or not): Focus on extracting the core concept from the user's message
@@ -256,10 +253,19 @@ You are an expert in laddering interviews and means-end chain theory. Your task
 {{
   "is_idea": true|false,
   "summary": "Brief 4-6 word summary of the user's actual message content",
-  "text_segment": "The exact portion of text containing the key concept",
-  "is_relevant": true|false,
-  "explanation": "Brief explanation of your reasoning"
+  "is_relevant": true|false
 }}
+""",
+
+    # Dynamic part of idea_check, sent as user message after the static system prompt
+    "idea_check_context": """
+## CONTEXT
+- Topic: {topic}
+- Stimulus: {stimulus}
+- Last question asked: "{last_question}"
+
+## USER RESPONSE TO ANALYZE
+"{message}"
 """,
 
 # ── Template that checks node merging ─────────────────────
@@ -268,31 +274,24 @@ You are an expert in laddering interviews and means-end chain theory. Your task
 # PARALLEL NODE SIMILARITY ANALYSIS
 
 Your task is to analyze a new element from a means-end chain interview and determine if it represents the SAME concept as any of the candidate elements, despite potentially having different wording.
-
-## NEW ELEMENT
-- Element type: {node_type}
-- Summary: "{new_node_summary}"
-- Full context path (from element to root): 
-{new_node_path}
-
-## CANDIDATE ELEMENTS TO COMPARE WITH
-{candidates_formatted}
+The INTERVIEW CONTEXT, the NEW ELEMENT and the CANDIDATE ELEMENTS TO COMPARE WITH are provided in the user turn.
 
 ## GUIDELINES FOR SIMILARITY ASSESSMENT
 1. Focus on the core meaning and intent behind each element, not just the specific wording
 2. Consider the hierarchical context - elements with similar parents may be more likely to be the same concept
-3. Consider the interview topic ({topic}) and stimulus ({stimulus}) when determining similarity
+3. Consider the interview topic and stimulus from the INTERVIEW CONTEXT when determining similarity
 4. Attributes (A) should match in their concrete characteristics
 5. Consequences (C) should match in their functional benefits or outcomes 
 6. Values (V) should match in their emotional significance or personal meaning
 
 ## YOUR TASK
-For EACH candidate element (0 to ({num_candidates} - 1)), independently determine if it represents the same underlying concept as the new element, considering:
+For EACH candidate element (ids 0 to number of candidates - 1, as listed in the user turn), independently determine if it represents the same underlying concept as the new element, considering:
 - Direct content similarity (meaning and intent)
 - Position in the means-end chain
 - Hierarchical relationships
 
 ## IMPORTANT
+- Each candidate starts with a "CANDIDATE <id>:" header; use exactly that id as candidate_id and return one result per candidate
 - Assess each candidate independently from the others
 - A candidate can be similar even if its wording is completely different, as long as it conveys the same core concept
 - Consider the context paths - nodes with similar parents often represent related concepts
@@ -320,5 +319,21 @@ For EACH candidate element (0 to ({num_candidates} - 1)), independently determin
 Take care to include all candidates in your json response and ensure the JSON is valid. Don't include any text outside the JSON structure.
 
 Confidence score should reflect your certainty in the assessment (0=completely uncertain, 100=completely certain).
+""",
+
+    # Dynamic part of node_similarity_check, sent as user message after the static system prompt
+    "node_similarity_check_context": """
+## INTERVIEW CONTEXT
+- Topic: {topic}
+- Stimulus: {stimulus}
+
+## NEW ELEMENT
+- Element type: {node_type}
+- Summary: "{new_node_summary}"
+- Full context path (from element to root): 
+{new_node_path}
+
+## CANDIDATE ELEMENTS TO COMPARE WITH ({num_candidates} candidates, ids 0 to {num_candidates_minus_one})
+{candidates_formatted}
 """,
 }
\ No newline at end of file
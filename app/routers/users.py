@@ -27,7 +27,12 @@ async def create_user(
     if res.scalar():
         raise HTTPException(status_code=409, detail="Username already taken")
 
-    new_user = User(username=payload.username, password=hash_password(payload.password))
+    try:
+        password_hash = hash_password(payload.password)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    new_user = User(username=payload.username, password=password_hash)
     db.add(new_user)
     await db.commit()
     await db.refresh(new_user)
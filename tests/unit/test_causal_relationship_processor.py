@@ -0,0 +1,210 @@
+"""
+Unit tests for the ACV chain filtering and the special-case handling in
+CausalRelationshipProcessor. The expected results are those of the original
+relationship-list implementation.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.interview.analysis.causal_relationship_processor import CausalRelationshipProcessor
+from app.interview.interview_tree.node_label import NodeLabel
+
+A = NodeLabel.ATTRIBUTE
+C = NodeLabel.CONSEQUENCE
+V = NodeLabel.VALUE
+
+PRICE = (A, "low price")
+SAVES = (C, "saves money")
+RELAXED = (C, "less stress")
+SECURITY = (V, "security")
+FREEDOM = (V, "freedom")
+
+
+def _elem(key, is_new=True):
+    return (key[0], key[1], is_new)
+
+
+def _rel(source, target):
+    return {"source_element": source, "target_element": target,
+            "relationship_type": "leads_to", "explanation": ""}
+
+
+def _pairs(relationships):
+    return [(rel["source_element"], rel["target_element"]) for rel in relationships]
+
+
+class _ActiveNode:
+    def __init__(self, label):
+        self.label = label
+
+    def get_label(self):
+        return self.label
+
+
+def _processor(active_label=None):
+    active = _ActiveNode(active_label) if active_label else None
+    return CausalRelationshipProcessor(SimpleNamespace(active=active))
+
+
+# (elements, relationships, surviving element keys, surviving relationships)
+ACV_CASES = {
+    "a_c_v_chain": (
+        [PRICE, SAVES, SECURITY],
+        [(PRICE, SAVES), (SAVES, SECURITY)],
+        [PRICE, SAVES],
+        [(PRICE, SAVES)],
+    ),
+    "a_c_c_v_chain": (
+        [PRICE, SAVES, RELAXED, SECURITY],
+        [(PRICE, SAVES), (SAVES, RELAXED), (RELAXED, SECURITY)],
+        [PRICE, SAVES, RELAXED],
+        [(PRICE, SAVES), (SAVES, RELAXED)],
+    ),
+    "c_c_v_without_attribute": (
+        [SAVES, RELAXED, SECURITY],
+        [(SAVES, RELAXED), (RELAXED, SECURITY)],
+        [SAVES, RELAXED, SECURITY],
+        [(SAVES, RELAXED), (RELAXED, SECURITY)],
+    ),
+    "c_c_v_with_unconnected_attribute": (
+        [PRICE, SAVES, RELAXED, SECURITY],
+        [(SAVES, RELAXED), (RELAXED, SECURITY)],
+        [PRICE, SAVES, RELAXED, SECURITY],
+        [(SAVES, RELAXED), (RELAXED, SECURITY)],
+    ),
+    "dangling_consequence": (
+        [PRICE, SAVES, RELAXED, SECURITY],
+        [(PRICE, SAVES), (RELAXED, SECURITY)],
+        [PRICE, SAVES, RELAXED, SECURITY],
+        [(PRICE, SAVES), (RELAXED, SECURITY)],
+    ),
+    "duplicate_edges": (
+        [PRICE, SAVES, SECURITY],
+        [(PRICE, SAVES), (SAVES, SECURITY), (PRICE, SAVES), (SAVES, SECURITY)],
+        [PRICE, SAVES],
+        [(PRICE, SAVES), (PRICE, SAVES)],
+    ),
+    "only_one_value_in_chain": (
+        [PRICE, SAVES, RELAXED, SECURITY, FREEDOM],
+        [(PRICE, SAVES), (SAVES, SECURITY), (RELAXED, FREEDOM)],
+        [PRICE, SAVES, RELAXED, FREEDOM],
+        [(PRICE, SAVES), (RELAXED, FREEDOM)],
+    ),
+    "direct_a_v_keeps_relationship": (
+        [PRICE, SECURITY],
+        [(PRICE, SECURITY)],
+        [PRICE],
+        [(PRICE, SECURITY)],
+    ),
+    "cycle_without_value": (
+        [PRICE, SAVES, RELAXED, SECURITY],
+        [(PRICE, SAVES), (SAVES, RELAXED), (RELAXED, SAVES)],
+        [PRICE, SAVES, RELAXED, SECURITY],
+        [(PRICE, SAVES), (SAVES, RELAXED), (RELAXED, SAVES)],
+    ),
+}
+
+
+@pytest.mark.parametrize("case", sorted(ACV_CASES))
+def test_filter_acv_chains(case):
+    element_keys, edges, expected_keys, expected_edges = ACV_CASES[case]
+    elements = [_elem(key) for key in element_keys]
+    relationships = [_rel(source, target) for source, target in edges]
+
+    filtered_elements, filtered_relationships = _processor().filter_acv_chains(elements, relationships)
+
+    assert [(elem[0], elem[1]) for elem in filtered_elements] == expected_keys
+    assert _pairs(filtered_relationships) == expected_edges
+
+
+# (active label, elements, relationships, surviving element keys)
+VALUE_PRIORITY_CASES = {
+    "direct_c_v": (
+        C,
+        [SAVES, RELAXED, SECURITY],
+        [(SAVES, SECURITY)],
+        [SAVES, SECURITY],
+    ),
+    "indirect_c_c_v": (
+        C,
+        [SAVES, RELAXED, SECURITY],
+        [(RELAXED, SAVES), (SAVES, SECURITY)],
+        [SAVES, RELAXED, SECURITY],
+    ),
+    "c_leading_away_from_value": (
+        C,
+        [SAVES, RELAXED, SECURITY],
+        [(SAVES, SECURITY), (SAVES, RELAXED)],
+        [SAVES, SECURITY],
+    ),
+    "attributes_are_kept": (
+        C,
+        [PRICE, SAVES, SECURITY],
+        [(PRICE, SAVES)],
+        [PRICE, SECURITY],
+    ),
+    "active_attribute_is_unfiltered": (
+        A,
+        [SAVES, RELAXED, SECURITY],
+        [(SAVES, SECURITY)],
+        [SAVES, RELAXED, SECURITY],
+    ),
+}
+
+
+@pytest.mark.parametrize("case", sorted(VALUE_PRIORITY_CASES))
+def test_filter_consequences_without_values(case):
+    active_label, element_keys, edges, expected_keys = VALUE_PRIORITY_CASES[case]
+    elements = [_elem(key) for key in element_keys]
+    relationships = [_rel(source, target) for source, target in edges]
+
+    filtered = _processor(active_label).filter_consequences_without_values(elements, relationships)
+
+    assert [(elem[0], elem[1]) for elem in filtered] == expected_keys
+
+
+# (active label, source key, source is new, expected result, expected created target keys)
+SPECIAL_CASES = {
+    "new_source_is_not_special": (A, PRICE, True, False, []),
+    "no_active_node": (None, PRICE, False, False, []),
+    "case_1_active_a_source_a": (A, PRICE, False, True, [SAVES]),
+    "case_1_active_a_source_c": (A, RELAXED, False, True, [SAVES]),
+    "case_2_active_c_source_c": (C, RELAXED, False, True, [SAVES]),
+    "case_2_active_c_source_v": (C, FREEDOM, False, True, [SAVES]),
+    "case_3_active_c_source_a": (C, PRICE, False, True, []),
+    "active_a_source_v": (A, FREEDOM, False, False, []),
+}
+
+
+@pytest.mark.parametrize("case", sorted(SPECIAL_CASES))
+@pytest.mark.asyncio
+async def test_process_source_element_special_cases(case):
+    active_label, source_key, source_is_new, expected_result, expected_created = SPECIAL_CASES[case]
+    processor = _processor(active_label)
+
+    # SAVES is a new end node, SECURITY was already known and must never be created
+    elements = [_elem(source_key, source_is_new), _elem(SAVES), _elem(SECURITY, is_new=False)]
+    relationships = [_rel(source_key, SAVES), _rel(source_key, SECURITY)]
+    elements_map, _, _, _, end_nodes_keys, _ = processor.build_element_mappings(elements, relationships)
+
+    created = []
+
+    async def node_creator(label, summary, **kwargs):
+        created.append((label, summary))
+        return f"node:{summary}"
+
+    processed_nodes = {}
+    all_processed_nodes = []
+    final_nodes = []
+    result = await processor.process_source_element_special_cases(
+        source_key, [SAVES, SECURITY], elements_map, node_creator,
+        processed_nodes, all_processed_nodes, end_nodes_keys, final_nodes)
+
+    assert result is expected_result
+    assert created == expected_created
+    expected_nodes = [(key, f"node:{key[1]}") for key in expected_created]
+    assert all_processed_nodes == expected_nodes
+    assert processed_nodes == dict(expected_nodes)
+    assert final_nodes == [node for _, node in expected_nodes]
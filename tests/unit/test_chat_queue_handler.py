@@ -0,0 +1,143 @@
+"""
+Unit tests for the priority order, duplicate checks and serialization of the
+heap-backed QueueManager. Nodes and tree are minimal stand-ins.
+"""
+
+from app.interview.handlers.chat_queue_handler import QueueManager
+from app.interview.interview_tree.node_label import NodeLabel
+
+S = NodeLabel.STIMULUS
+A = NodeLabel.ATTRIBUTE
+C = NodeLabel.CONSEQUENCE
+
+
+class _FakeNode:
+    def __init__(self, node_id, label):
+        self.id = node_id
+        self.label = label
+
+    def get_label(self):
+        return self.label
+
+    def get_conclusion(self):
+        return self.id
+
+
+class _FakeTree:
+    def __init__(self, nodes):
+        self.active = None
+        self.nodes = nodes
+
+    def set_active_node(self, node):
+        self.active = node
+
+    def remove_irrelevant_node(self):
+        self.active = None
+
+    def get_id_map(self):
+        return {n.id: n for n in self.nodes}
+
+
+def _queue_manager(nodes, stimuli=()):
+    """QueueManager on a tree with all given nodes, the first stimulus already active."""
+    stimuli = list(stimuli) or [_FakeNode("s0", S)]
+    tree = _FakeTree(stimuli + list(nodes))
+    queue_manager = QueueManager()
+    queue_manager.set_tree(tree)
+    queue_manager.initialize_stimuli_queue(list(stimuli))
+    return queue_manager
+
+
+def _drain(queue_manager):
+    order = []
+    while (node := queue_manager.get_next_active_node()) is not None:
+        order.append(node.id)
+    return order
+
+
+def test_consequences_newest_first_then_attributes_then_others_then_stimuli():
+    nodes = [_FakeNode("a1", A), _FakeNode("c1", C), _FakeNode("a2", A), _FakeNode("c2", C),
+             _FakeNode("c3", C)]
+    stimuli = [_FakeNode("s0", S), _FakeNode("s1", S), _FakeNode("s2", S)]
+    queue_manager = _queue_manager(nodes, stimuli)
+
+    # add_to_queue never queues other labels, push one directly to check the default priority
+    other = _FakeNode("o1", NodeLabel.IDEA)
+    queue_manager._push(other, other.get_label())
+    for node in nodes:
+        queue_manager.add_to_queue(node)
+
+    assert _drain(queue_manager) == ["c3", "c2", "c1", "a1", "a2", "o1", "s1", "s2"]
+
+
+def test_duplicates_are_rejected_across_heap_and_stimuli():
+    a1, c1 = _FakeNode("a1", A), _FakeNode("c1", C)
+    stimuli = [_FakeNode("s0", S), _FakeNode("s1", S)]
+    queue_manager = _queue_manager([a1, c1], stimuli)
+
+    queue_manager.add_to_queue(a1)
+    queue_manager.add_to_queue(c1)
+    queue_manager.add_to_queue(a1)
+    queue_manager.add_to_queue(c1)
+    # s1 is still pending as a stimulus
+    queue_manager.add_to_queue(stimuli[1])
+    # Same ID as a queued attribute, but labelled as a stimulus
+    queue_manager.add_to_queue(_FakeNode("a1", S))
+
+    assert [n.id for n in queue_manager._ordered_nodes()] == ["c1", "a1", "s1"]
+    assert _drain(queue_manager) == ["c1", "a1", "s1"]
+
+    # Once popped, a node may be queued again
+    queue_manager.add_to_queue(a1)
+    assert _drain(queue_manager) == ["a1"]
+
+
+def test_round_trip_keeps_order_and_new_consequences_come_first():
+    nodes = [_FakeNode("a1", A), _FakeNode("c1", C), _FakeNode("a2", A), _FakeNode("c2", C),
+             _FakeNode("c3", C), _FakeNode("c4", C)]
+    stimuli = [_FakeNode("s0", S), _FakeNode("s1", S)]
+    queue_manager = _queue_manager(nodes, stimuli)
+    for node in nodes[:4]:
+        queue_manager.add_to_queue(node)
+    queue_manager.update_unchanged_count(False)
+
+    data = queue_manager.to_dict()
+    assert [entry["id"] for entry in data["queue"]] == ["c2", "c1", "a1", "a2", "s1"]
+
+    restored = QueueManager.from_dict(data, queue_manager.tree)
+    assert restored.to_dict() == data
+    assert restored.active_node is queue_manager.active_node
+
+    # Consequences pushed after the restore still come before the restored ones, newest first
+    restored.add_to_queue(nodes[4])
+    restored.add_to_queue(nodes[5])
+    restored.add_to_queue(nodes[0])
+    assert _drain(restored) == ["c4", "c3", "c2", "c1", "a1", "a2", "s1"]
+
+
+def test_from_dict_skips_nodes_missing_from_tree():
+    a1 = _FakeNode("a1", A)
+    tree = _FakeTree([a1])
+    data = {"queue": [{"id": "gone"}, {"id": "a1"}], "active_node": {"id": "gone"},
+            "active_node_unchanged_count": 2}
+
+    restored = QueueManager.from_dict(data, tree)
+
+    assert [n.id for n in restored._ordered_nodes()] == ["a1"]
+    assert restored.active_node is None
+    assert restored.active_node_unchanged_count == 2
+
+
+def test_stimulus_is_popped_when_heap_is_empty():
+    stimuli = [_FakeNode("s0", S), _FakeNode("s1", S), _FakeNode("s2", S)]
+    c1 = _FakeNode("c1", C)
+    queue_manager = _queue_manager([c1], stimuli)
+    assert queue_manager.tree.active is stimuli[0]
+
+    assert queue_manager.get_next_active_node() is stimuli[1]
+    assert queue_manager.tree.active is stimuli[1]
+
+    queue_manager.add_to_queue(c1)
+    assert queue_manager.get_next_active_node() is c1
+    assert queue_manager.get_next_active_node() is stimuli[2]
+    assert queue_manager.get_next_active_node() is None
@@ -0,0 +1,121 @@
+"""
+Unit tests for the LLM response cache and the coalescing of concurrent identical
+requests in ElementAnalyzer. The LLM is replaced by a stub client.
+"""
+
+import asyncio
+
+import orjson
+import pytest
+
+from app.interview.analysis import element_analyzer
+from app.interview.analysis.element_analyzer import ElementAnalyzer
+
+IDEA_REPLY = {"is_idea": True, "summary": "offline playlists", "is_relevant": True}
+
+
+class _StubClient:
+    """Counts the LLM calls; each call yields to the event loop before answering."""
+
+    provider = "stub"
+    model = "stub-model"
+
+    def __init__(self, reply=None, error=None):
+        self.reply = orjson.dumps(reply or IDEA_REPLY).decode()
+        self.error = error
+        self.calls = 0
+
+    async def query_with_structured_output(self, messages, schema, temperature=None, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        if self.error is not None:
+            raise self.error
+        return self.reply
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    element_analyzer._response_cache.clear()
+    element_analyzer._inflight_responses.clear()
+    yield
+    element_analyzer._response_cache.clear()
+    element_analyzer._inflight_responses.clear()
+
+
+def _query(client, message="I like offline playlists"):
+    template_vars = {"topic": "Music", "stimulus": "Offline mode", "message": message, "last_question": ""}
+    return ElementAnalyzer._query_structured_cached(
+        client, ElementAnalyzer.TEMPLATE_IDEA_CHECK, ElementAnalyzer.TEMPLATE_IDEA_CHECK_CONTEXT,
+        template_vars, element_analyzer._IDEA_SCHEMA,
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_calls_share_one_llm_call():
+    client = _StubClient()
+
+    first, second = await asyncio.gather(_query(client), _query(client))
+
+    assert first == second == IDEA_REPLY
+    assert client.calls == 1
+    assert not element_analyzer._inflight_responses
+
+    # Served from the cache afterwards
+    assert await _query(client) == IDEA_REPLY
+    assert client.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_different_messages_are_not_coalesced():
+    client = _StubClient()
+
+    await asyncio.gather(_query(client, "first answer"), _query(client, "second answer"))
+
+    assert client.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_call_is_neither_cached_nor_left_inflight():
+    client = _StubClient(error=RuntimeError("LLM unavailable"))
+
+    results = await asyncio.gather(_query(client), _query(client), return_exceptions=True)
+
+    # Both waiting callers see the failure of the single shared call
+    assert client.calls == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert not element_analyzer._inflight_responses
+    assert not element_analyzer._response_cache
+
+    # The next request goes to the LLM again
+    client.error = None
+    assert await _query(client) == IDEA_REPLY
+    assert client.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_unparseable_reply_is_not_cached():
+    client = _StubClient()
+    client.reply = "no json here"
+
+    first = await _query(client)
+    assert "error" in first
+    assert not element_analyzer._response_cache
+
+    await _query(client)
+    assert client.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_the_shared_call():
+    client = _StubClient()
+
+    cancelled = asyncio.create_task(_query(client))
+    waiting = asyncio.create_task(_query(client))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+
+    assert await waiting == IDEA_REPLY
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+    assert client.calls == 1
+    assert not element_analyzer._inflight_responses